@@ -1,19 +1,22 @@
 import asyncio
-import copy
+import functools
 import logging
 import os
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping, Sequence
 from typing import Any
 
-from dotenv import load_dotenv
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
 
+from agents.breaker import breaker_for, is_outage
+from agents.cache import IN_FLIGHT, RESPONSE_CACHE, SEMANTIC_CACHE, cache_key, is_cacheable
 from agents.factory import LLMFactory
 from utils.config import ConfigLoader
+from utils.env import load_env
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 logger = logging.getLogger(__name__)
 
@@ -75,23 +78,40 @@ def format_feedback_history(history: Any) -> str:
         return "No previous feedback"
 
     total = len(history)
-    recent = list(history)[-FEEDBACK_MAX_ENTRIES:]
-
-    formatted = []
-    for entry in recent:
-        if not isinstance(entry, dict):
-            formatted.append(_clip(entry, FEEDBACK_RESPONSE_CHAR_BUDGET))
-            continue
-        formatted.append(
-            f"Stage: {entry.get('stage', 'unknown')}\n"
-            f"Response: {_clip(entry.get('response', ''), FEEDBACK_RESPONSE_CHAR_BUDGET)}\n"
-            f"Feedback: {_clip(entry.get('feedback', ''), FEEDBACK_RESPONSE_CHAR_BUDGET)}\n"
-        )
-
-    if total > len(recent):
-        formatted.insert(0, f"(showing the {len(recent)} most recent of {total} feedback entries)\n")
-
-    return _clip("\n".join(formatted), FEEDBACK_CHAR_BUDGET)
+    # Slice in place: history grows without bound across sessions, and copying
+    # all of it to keep the last few made every prompt O(history).
+    recent = history[-FEEDBACK_MAX_ENTRIES:] if isinstance(history, Sequence) else list(history)[-FEEDBACK_MAX_ENTRIES:]
+
+    # Every agent in a run renders the same history, so the block is cached on
+    # the fields it is built from. A field that is not hashable (not a string,
+    # in practice) is rendered uncached.
+    window = tuple(
+        (entry.get('stage', 'unknown'), entry.get('response', ''), entry.get('feedback', ''))
+        if isinstance(entry, dict) else str(entry)
+        for entry in recent
+    )
+    args = (window, total, FEEDBACK_RESPONSE_CHAR_BUDGET, FEEDBACK_CHAR_BUDGET)
+    try:
+        return _render_feedback_history(*args)
+    except TypeError:
+        return _render_feedback_history.__wrapped__(*args)
+
+
+@functools.lru_cache(maxsize=32)
+def _render_feedback_history(
+    window: tuple[Any, ...], total: int, entry_budget: int, budget: int
+) -> str:
+    header = (
+        f"(showing the {len(window)} most recent of {total} feedback entries)\n\n"
+        if total > len(window) else ""
+    )
+    return _clip(header + "\n".join(
+        f"Stage: {entry[0]}\n"
+        f"Response: {_clip(entry[1], entry_budget)}\n"
+        f"Feedback: {_clip(entry[2], entry_budget)}\n"
+        if isinstance(entry, tuple) else _clip(entry, entry_budget)
+        for entry in window
+    ), budget)
 
 
 def extract_usage(response: Any) -> dict[str, Any]:
@@ -137,6 +157,21 @@ def extract_usage(response: Any) -> dict[str, Any]:
     return usage
 
 
+async def collect_stream(runnable: Any, messages: Any) -> Any:
+    """Stream a reply and merge the chunks into one message.
+
+    Chunks add up field by field, so the result carries the full content plus
+    the usage and finish reason (which arrive on the last chunk) exactly as an
+    ainvoke response would -- extract_usage and the cache see no difference.
+    """
+    response = None
+    async for chunk in runnable.astream(messages):
+        response = chunk if response is None else response + chunk
+    if response is None:
+        raise ValueError("Model returned an empty stream")
+    return response
+
+
 def state_text(state: Mapping[str, Any], key: str, placeholder: str) -> str:
     """Read a text field, falling back to `placeholder` when it is blank.
 
@@ -179,6 +214,23 @@ def summarize_state(state: Mapping[str, Any]) -> str:
     return "\n".join(parts)
 
 
+# Template variables a near-duplicate prompt may differ in (see
+# BaseAgent.semantic_query); the rest of a prompt must match exactly.
+SEMANTIC_FIELDS = ("task", "feedback")
+
+
+# How each template variable is derived from state -- the one place the
+# defaults live, for BaseAgent and DLPFC's two prompts alike. The fallbacks are
+# the sentinels the prompts were written against; see state_text.
+PROMPT_INPUTS: dict[str, Callable[[Mapping[str, Any]], Any]] = {
+    "task": lambda state: state.get("task", ""),
+    "state": summarize_state,
+    "previous_response": lambda state: state_text(state, "previous_response", "No previous response"),
+    "feedback": lambda state: state_text(state, "feedback", "No feedback provided"),
+    "feedback_history": lambda state: format_feedback_history(state.get("feedback_history")),
+}
+
+
 class BaseAgent(ABC):
     """Base class for all Prefrontal Cortex agents in the SCANUE-V system.
 
@@ -214,7 +266,7 @@ class BaseAgent(ABC):
             logger.debug("Initializing %s with configured models: %s", agent_name, list(model_configs.keys()))
             for model_type, config in model_configs.items():
                 try:
-                    self.models[model_type] = LLMFactory.create_llm(config)
+                    self.models[model_type] = LLMFactory.shared_llm(config)
                 except Exception as e:
                     # A model that cannot be constructed is a real problem (bad
                     # provider name, missing credentials, unreachable base_url).
@@ -237,7 +289,7 @@ class BaseAgent(ABC):
                 "primary",
                 env_var_fallback=model_env_key
             )
-            self.models["primary"] = LLMFactory.create_llm(fallback_config)
+            self.models["primary"] = LLMFactory.shared_llm(fallback_config)
             self.model_config = fallback_config
 
         # Set primary model as default self.llm for backward compatibility
@@ -247,7 +299,8 @@ class BaseAgent(ABC):
         self.llm: Any = llm
 
         self.llm_timeout = resolve_llm_timeout(self.model_config)
-        self.prompt = self._create_prompt()     # Agent-specific prompt template
+        # Agent-specific prompt template
+        self.prompt = self._class_prompt("_prompt_template", self._create_prompt)
         # Cache of the most recent call, for debugging and the session log.
         self.last_raw_response: dict[str, Any] | None = None
 
@@ -263,6 +316,16 @@ class BaseAgent(ABC):
             "provider": (self.model_config or {}).get("provider", "openai"),
         }
 
+    def cache_identity(self) -> dict[str, Any]:
+        """The model side of this agent's cache keys: its whole resolved config.
+
+        Keys used to carry only model_descriptor(), so two configs naming the
+        same model -- but a different base_url, max_tokens or num_ctx -- shared
+        entries, and one could be served a reply produced under the other's
+        limits or by another host.
+        """
+        return {**(self.model_config or {}), **self.model_descriptor()}
+
     def invoker(self):
         """The primary model wrapped in the configured retry policy.
 
@@ -271,6 +334,105 @@ class BaseAgent(ABC):
         """
         return LLMFactory.wrap_with_retry(self.llm, self.model_config)
 
+    def _stream_invoker(self):
+        """Streaming counterpart of `invoker`: collect_stream under the retry policy.
+
+        RunnableRetry retries ainvoke only; astream on the wrapper goes straight
+        to the model, so `stream: true` used to drop transport retries. The whole
+        collection is the retried unit instead -- a stream that drops midway
+        starts over.
+        """
+        llm = self.llm
+
+        async def collect(messages: Any) -> Any:
+            return await collect_stream(llm, messages)
+
+        return LLMFactory.wrap_with_retry(RunnableLambda(collect), self.model_config)
+
+    def prompt_inputs(
+        self, state: Mapping[str, Any], prompt: ChatPromptTemplate | None = None
+    ) -> dict[str, Any]:
+        """Template variables for `prompt` (this agent's by default), from `state`.
+
+        Every variable used to be built on every call whether or not the template
+        had a slot for it -- including the state summary and the rendered
+        feedback history, the two expensive ones -- only for format_messages to
+        ignore the extras. The template declares its variables when it is built,
+        so only those are computed.
+        """
+        variables = (prompt or self.prompt).input_variables
+        return {name: PROMPT_INPUTS[name](state) for name in variables if name in PROMPT_INPUTS}
+
+    async def _invoke(self, messages: Any, runnable: Any = None) -> Any:
+        """Call `runnable` (the retry-wrapped primary model by default).
+
+        The inner timeout covers all retry attempts, so a flapping provider
+        cannot exceed the node budget. The call goes through the model's
+        circuit breaker (agents/breaker.py): while it is open this raises
+        CircuitOpenError at once instead of waiting out another timeout.
+
+        With `stream: true` in the model config the reply is streamed and
+        reassembled (see collect_stream). A non-streamed request sends nothing
+        back until generation ends, so a slow local model generating a long
+        answer could trip the client's read timeout while still working;
+        streamed tokens keep the connection live.
+        """
+        descriptor = self.model_descriptor()
+        breaker = breaker_for(f"{descriptor['provider']}:{descriptor['model']}")
+        breaker.before_call()
+
+        # Streaming applies to plain chat replies only; a structured-output
+        # runnable streams partial objects, not text.
+        if runnable is None and self.model_config.get("stream"):
+            call = self._stream_invoker().ainvoke(messages)
+        else:
+            call = (runnable or self.invoker()).ainvoke(messages)
+        try:
+            response = await asyncio.wait_for(call, timeout=self.llm_timeout)
+        except Exception as e:
+            if is_outage(e):
+                breaker.record_failure()
+            else:
+                # Says nothing about an outage either way: a refusal is no
+                # success, and resetting here let one bad request wipe out a
+                # run of connection failures.
+                breaker.release()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
+        return response
+
+    def semantic_query(self, inputs: Mapping[str, Any], scope: str) -> tuple[str, str]:
+        """Scope and text for a semantic-tier lookup of a prompt built from `inputs`.
+
+        Embedding the whole rendered prompt made every call look alike: a
+        couple of hundred words of fixed instructions, state summary and
+        feedback history, with the task a few words of it, so two different
+        tasks cleared the similarity threshold and one got the other's answer.
+        Only the free text a user might rephrase -- SEMANTIC_FIELDS -- is
+        embedded. Everything else must match exactly, so it is hashed into the
+        scope.
+        """
+        text = "\n".join(str(inputs[name]) for name in SEMANTIC_FIELDS if name in inputs)
+        context = {name: value for name, value in inputs.items() if name not in SEMANTIC_FIELDS}
+        return f"{scope}|{cache_key(self.cache_identity(), context)}", text
+
+    def _class_prompt(self, name: str, build: Callable[[], ChatPromptTemplate]) -> ChatPromptTemplate:
+        """`build()`, built once per agent class and kept on it as `name`.
+
+        A prompt is fixed per class, but agents are constructed for every stage
+        of every run, and each construction parsed the template again. Prompt
+        templates are not changed by formatting, so one instance can be shared.
+        """
+        cls = type(self)
+        prompt = cls.__dict__.get(name)
+        if prompt is None:
+            prompt = build()
+            setattr(cls, name, prompt)
+        return prompt
+
     @abstractmethod
     def _create_prompt(self) -> ChatPromptTemplate:
         """Create the specialized prompt template for this agent.
@@ -331,13 +493,8 @@ class BaseAgent(ABC):
         try:
             # Format prompt messages. Only a compact state summary is injected to
             # limit token bloat and prompt-injection surface.
-            formatted_messages = self.prompt.format_messages(
-                task=state.get("task", ""),
-                state=summarize_state(state),
-                previous_response=state_text(state, "previous_response", "No previous response"),
-                feedback=state_text(state, "feedback", "No feedback provided"),
-                feedback_history=format_feedback_history(state.get("feedback_history", []))
-            )
+            inputs = self.prompt_inputs(state)
+            formatted_messages = self.prompt.format_messages(**inputs)
 
             # Log the prompt size. Ollama silently drops anything past num_ctx,
             # so without this a truncated prompt is completely invisible.
@@ -347,20 +504,68 @@ class BaseAgent(ABC):
                 self.agent_name, prompt_chars, prompt_chars // 4,
             )
 
-            # Invoke the LLM through the retry wrapper. The timeout covers all
-            # attempts, so a flapping provider cannot exceed the node budget.
-            response = await asyncio.wait_for(
-                self.invoker().ainvoke(formatted_messages),
-                timeout=self.llm_timeout
-            )
+            serialized_prompt = self._serialize_messages(formatted_messages)
+
+            # A temperature-0 model answers the same prompt the same way, so a
+            # repeat is served from the cache without a provider round-trip.
+            key = cache_key(self.cache_identity(), serialized_prompt) if is_cacheable(self.llm) else None
+            hit = RESPONSE_CACHE.get(key) if key else None
+
+            # The same call already in flight: share its reply (see InFlight).
+            pending = IN_FLIGHT.get(key) if key and hit is None else None
+            if pending is not None:
+                hit = await IN_FLIGHT.follow(pending)
+
+            # Registered before any further await, so an identical call that
+            # arrives during the semantic lookup follows this one.
+            flight = IN_FLIGHT.start(key) if key and hit is None else None
+            similarity = None
+            scope = vector = None
+            try:
+                # Near-duplicate prompts (opt-in, see agents/cache.py).
+                if flight is not None and SEMANTIC_CACHE.enabled:
+                    scope, text = self.semantic_query(inputs, f"{self.agent_name}|{self.model_descriptor()['model']}")
+                    vector = await asyncio.to_thread(SEMANTIC_CACHE.embed, text)
+                    semantic_hit = SEMANTIC_CACHE.get(scope, vector)
+                    if semantic_hit is not None:
+                        hit, similarity = semantic_hit
+
+                if hit is None:
+                    # Retry-wrapped, under the inner timeout and the model's breaker.
+                    response = await self._invoke(formatted_messages)
+            except BaseException as e:
+                if key and flight:
+                    IN_FLIGHT.fail(key, flight, e)
+                raise
+
+            cached = hit is not None
+
+            if hit is not None:
+                logger.debug("%s served from the response cache", self.agent_name)
+                content = hit
+                # Nothing was generated, so nothing was billed.
+                usage: dict[str, Any] = {}
+            else:
+                content = response.content
+                usage = extract_usage(response)
+                # A truncated answer is not worth replaying.
+                if key and usage.get("finish_reason") != "length":
+                    RESPONSE_CACHE.put(key, content)
+                    if scope is not None:
+                        SEMANTIC_CACHE.put(scope, vector, content)
+            if key and flight:
+                IN_FLIGHT.finish(key, flight, content)
 
             # Store the complete raw response for logging
             self.last_raw_response = {
                 **self.model_descriptor(),
-                "prompt": self._serialize_messages(formatted_messages),
+                "prompt": serialized_prompt,
                 "prompt_chars": prompt_chars,
-                "response": response.content,
-                "usage": extract_usage(response),
+                "response": content,
+                "usage": usage,
+                "cached": cached,
+                # Only set for a near-duplicate (semantic) hit.
+                "cache_similarity": similarity,
                 "metadata": {
                     "temperature": getattr(self.llm, "temperature", None),
                     # max_tokens might not exist on all model types; Ollama's
@@ -372,10 +577,12 @@ class BaseAgent(ABC):
             }
 
             # Format the response
-            formatted_result = self._format_response(response.content)
+            formatted_result = self._format_response(content)
 
-            # Include raw response
-            formatted_result["raw_llm_response"] = copy.deepcopy(self.last_raw_response)
+            # Shared, not copied: the record is built fresh on every call and
+            # nothing downstream mutates it, so a deepcopy of the prompt and
+            # metadata here was a full object-graph walk per call for nothing.
+            formatted_result["raw_llm_response"] = self.last_raw_response
 
             return formatted_result
         except TimeoutError:
@@ -0,0 +1,112 @@
+"""Per-model circuit breaker for LLM calls.
+
+When a provider goes down, every agent in a run still made its own call and
+waited out its own timeout (and retries) before failing -- five or six stages,
+each burning the full budget to learn what the first one already knew. Once a
+model has failed FAIL_MAX calls in a row, the breaker opens and further calls
+fail immediately, without network I/O, until RESET_SECONDS have passed. Then a
+single probe call is let through: success closes the breaker, failure re-opens
+it for another RESET_SECONDS.
+
+Only outages count as failures: connection errors, timeouts, rate limits and
+server errors (see `is_transient`). Any other rejected request means the server
+is up and answering; it leaves the count as it was.
+
+Set SCANUE_BREAKER_FAIL_MAX=0 to disable.
+"""
+
+import logging
+import os
+import time
+
+from agents.factory import is_transient
+from utils.env import load_env
+
+logger = logging.getLogger(__name__)
+
+# The settings below are read at import, which can precede main.py loading .env.
+load_env()
+
+BREAKER_FAIL_MAX = int(os.getenv("SCANUE_BREAKER_FAIL_MAX", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("SCANUE_BREAKER_RESET", "30"))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a model whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one model.
+
+    No lock: state only changes between awaits, so on a single event loop no
+    two calls can interleave inside it.
+    """
+
+    def __init__(self, name: str, fail_max: int | None = None, reset_seconds: float | None = None):
+        self.name = name
+        self.fail_max = BREAKER_FAIL_MAX if fail_max is None else fail_max
+        self.reset_seconds = BREAKER_RESET_SECONDS if reset_seconds is None else reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go out now."""
+        if self.fail_max <= 0 or self.opened_at is None:
+            return
+        remaining = self.opened_at + self.reset_seconds - time.monotonic()
+        if remaining > 0 or self._probing:
+            raise CircuitOpenError(
+                f"{self.name} failed {self.failures} calls in a row; "
+                f"not calling it again for {max(remaining, 0):.0f}s"
+            )
+        # Half-open: this call is the probe; everyone else keeps failing fast.
+        self._probing = True
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("%s is answering again; circuit closed", self.name)
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.fail_max > 0 and self.failures >= self.fail_max:
+            if self.opened_at is None:
+                logger.warning(
+                    "%s failed %d calls in a row; failing fast for %ss",
+                    self.name, self.failures, self.reset_seconds,
+                )
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Forget an in-flight probe that ended without a verdict (cancelled)."""
+        self._probing = False
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+
+
+def breaker_for(name: str) -> CircuitBreaker:
+    """The breaker shared by every agent calling the model `name`."""
+    breaker = _BREAKERS.get(name)
+    if breaker is None:
+        breaker = _BREAKERS[name] = CircuitBreaker(name)
+    return breaker
+
+
+def reset_breakers() -> None:
+    """Close and forget every breaker (tests)."""
+    _BREAKERS.clear()
+
+
+def is_outage(error: BaseException) -> bool:
+    """True for failures that say the model is unreachable or overloaded, not
+    that it said no."""
+    return is_transient(error)
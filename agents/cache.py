@@ -0,0 +1,298 @@
+"""In-process cache for deterministic LLM responses.
+
+Every stage of a run awaits a provider round-trip, which costs seconds and bills
+tokens. When a model runs at temperature 0 the same rendered prompt produces the
+same answer, so re-asking is pure waste -- in an interactive session, re-running
+a task (or re-running it after feedback that left the prompt unchanged) paid for
+every stage again.
+
+Only temperature-0 calls are cached: at any other temperature a repeat is a
+legitimate new sample, and replaying the first one would silently change the
+behaviour the user configured. Set SCANUE_LLM_CACHE_TTL=0 to disable caching.
+
+An optional second tier (SCANUE_SEMANTIC_CACHE=1) also serves prompts that are
+near-duplicates of a cached one -- differing only in whitespace or the phrasing
+of a piece of feedback -- by embedding similarity. It needs the `semantic`
+extra (numpy + fastembed) and is off by default: a threshold is a judgement
+call, and a false hit answers a question the user did not ask.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - present wherever langsmith is
+    orjson = None  # type: ignore[assignment]
+
+from utils.env import load_env
+
+logger = logging.getLogger(__name__)
+
+# The settings below are read at import, which can precede main.py loading .env.
+load_env()
+
+# Seconds a cached response stays valid; 0 disables the cache entirely.
+LLM_CACHE_TTL_SECONDS = float(os.getenv("SCANUE_LLM_CACHE_TTL", "3600"))
+# Least-recently-used entries are evicted past this many.
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("SCANUE_LLM_CACHE_SIZE", "1024"))
+
+SEMANTIC_CACHE_ENABLED = os.getenv("SCANUE_SEMANTIC_CACHE", "0") == "1"
+# Cosine similarity a cached prompt must exceed to stand in for a new one.
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SCANUE_SEMANTIC_CACHE_THRESHOLD", "0.97"))
+SEMANTIC_CACHE_MODEL = os.getenv("SCANUE_SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+
+class ResponseCache:
+    """A bounded LRU mapping of prompt hash -> response text, with expiry.
+
+    No lock: lookups and stores never await, so on a single event loop they
+    cannot interleave.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttl: float = LLM_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expiry, value = entry
+        if expiry < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticCache:
+    """Second-tier cache matching prompts by embedding similarity.
+
+    Entries are partitioned by scope (agent + model): the specialists share most
+    of their context, and a VMPFC prompt must never be answered with OFC's reply
+    however similar the two look. Each scope keeps its L2-normalized embeddings
+    in one matrix, so a lookup is a single matrix-vector product.
+
+    `embed` maps text to a vector. When omitted, a fastembed model is loaded on
+    first use; if numpy or fastembed is missing the cache disables itself with
+    a warning rather than failing the call.
+    """
+
+    # Rows are allocated in blocks so growth is not a reallocation per insert.
+    _BLOCK = 256
+
+    def __init__(
+        self,
+        embed: Any = None,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl: float = LLM_CACHE_TTL_SECONDS,
+        enabled: bool = SEMANTIC_CACHE_ENABLED,
+    ):
+        self._embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._enabled = enabled
+        # scope -> (embeddings, expiries, values, count)
+        self._scopes: dict[str, list[Any]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled and self.ttl > 0 and self.max_entries > 0
+
+    def _embedder(self) -> Any:
+        if self._embed is None:
+            try:
+                import numpy  # noqa: F401
+                from fastembed import TextEmbedding
+            except ImportError:
+                logger.warning(
+                    "SCANUE_SEMANTIC_CACHE is set but numpy/fastembed are not installed "
+                    "(pip install -e \".[semantic]\"); semantic caching is disabled"
+                )
+                self._enabled = False
+                return None
+            model = TextEmbedding(SEMANTIC_CACHE_MODEL)
+            self._embed = lambda text: next(iter(model.embed([text])))
+        return self._embed
+
+    def embed(self, text: str) -> Any | None:
+        """L2-normalized embedding of `text`, or None when the tier is unavailable.
+
+        CPU-bound; callers on the event loop should run it in a thread.
+        """
+        if not self.enabled:
+            return None
+        embed = self._embedder()
+        if embed is None:
+            return None
+        import numpy as np
+
+        vector = np.asarray(embed(text), dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    def get(self, scope: str, vector: Any) -> tuple[Any, float] | None:
+        """Best cached value in `scope` above the threshold, with its similarity."""
+        entry = self._scopes.get(scope)
+        if vector is None or entry is None or not entry[3]:
+            return None
+        import numpy as np
+
+        embeddings, expiries, values, count = entry
+        sims = embeddings[:count] @ vector
+        sims[expiries[:count] < time.monotonic()] = -1.0
+        best = int(np.argmax(sims))
+        if sims[best] <= self.threshold:
+            return None
+        return values[best], float(sims[best])
+
+    def put(self, scope: str, vector: Any, value: Any) -> None:
+        if vector is None or not self.enabled:
+            return
+        import numpy as np
+
+        entry = self._scopes.get(scope)
+        if entry is None:
+            entry = [np.zeros((0, vector.shape[0]), dtype=np.float32), np.zeros(0), [], 0]
+            self._scopes[scope] = entry
+        embeddings, expiries, values, count = entry
+
+        if count < self.max_entries:
+            if count == embeddings.shape[0]:
+                grow = min(self._BLOCK, self.max_entries - count)
+                embeddings = np.vstack([embeddings, np.zeros((grow, vector.shape[0]), dtype=np.float32)])
+                expiries = np.concatenate([expiries, np.zeros(grow)])
+            row = count
+            values.append(value)
+            count += 1
+        else:
+            # Full: overwrite the entry closest to expiry, i.e. the oldest.
+            row = int(np.argmin(expiries[:count]))
+            values[row] = value
+
+        embeddings[row] = vector
+        expiries[row] = time.monotonic() + self.ttl
+        self._scopes[scope] = [embeddings, expiries, values, count]
+
+    def clear(self) -> None:
+        self._scopes.clear()
+
+    def __len__(self) -> int:
+        return sum(entry[3] for entry in self._scopes.values())
+
+
+class InFlight:
+    """Single-flight registry: identical concurrent calls share one request.
+
+    The cache only helps once a reply has come back. Two identical prompts
+    issued together -- a re-run started while the first is still generating,
+    say -- both missed it and both paid for generation. The first caller
+    registers a future under the cache key; later ones await it instead of
+    calling the provider.
+
+    Only used for cacheable (temperature-0) calls, for the same reason as the
+    cache: at any other temperature a second call is a legitimate new sample.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future[Any]] = {}
+
+    def get(self, key: str) -> asyncio.Future[Any] | None:
+        return self._calls.get(key)
+
+    def start(self, key: str) -> asyncio.Future[Any]:
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        return future
+
+    def finish(self, key: str, future: asyncio.Future[Any], value: Any) -> None:
+        self._forget(key, future)
+        future.set_result(value)
+
+    def fail(self, key: str, future: asyncio.Future[Any], error: BaseException) -> None:
+        self._forget(key, future)
+        if isinstance(error, Exception):
+            future.set_exception(error)
+            # Followers re-raise it; with none, do not log it as never retrieved.
+            future.exception()
+        else:
+            future.cancel()
+
+    @staticmethod
+    async def follow(future: asyncio.Future[Any]) -> Any | None:
+        """The leader's reply, its exception, or None if the leader was cancelled."""
+        try:
+            # Shielded: a follower being cancelled must not cancel the leader.
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if future.cancelled():
+                return None
+            raise
+
+    def _forget(self, key: str, future: asyncio.Future[Any]) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+# Shared by every agent, so a repeat is a hit regardless of which agent
+# instance (they are rebuilt per stage) made the original call.
+RESPONSE_CACHE = ResponseCache()
+SEMANTIC_CACHE = SemanticCache()
+IN_FLIGHT = InFlight()
+
+
+def is_cacheable(llm: Any) -> bool:
+    """True when `llm` is deterministic enough for a cached reply to stand in."""
+    temperature = getattr(llm, "temperature", None)
+    # A mocked or unfamiliar model can carry anything here; only a real zero counts.
+    return isinstance(temperature, int | float) and temperature == 0 and RESPONSE_CACHE.enabled
+
+
+def cache_key(model: dict[str, Any], messages: Any) -> str:
+    """Stable digest of the resolved model and the fully rendered prompt.
+
+    The prompt carries the feedback history and every earlier agent's analysis,
+    so it is the largest thing serialized per call. orjson (installed with
+    langsmith) encodes it several times faster than the stdlib; keys only need
+    to be stable within one process, so the two encoders need not agree.
+    """
+    payload = {"model": model, "messages": messages}
+    encoded = None
+    if orjson is not None:
+        # TypeError: integers past 64 bits, for one; the stdlib handles them.
+        with contextlib.suppress(TypeError):
+            encoded = orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    if encoded is None:
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
@@ -1,25 +1,84 @@
 import asyncio
-import copy
 import inspect
 import logging
-from collections.abc import Mapping
+import re
+from collections.abc import Iterator, Mapping
 from typing import Any
 
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 
+from agents.cache import RESPONSE_CACHE, SEMANTIC_CACHE, cache_key, is_cacheable
 from agents.factory import LLMFactory
 
 from .base import (
     BaseAgent,
     extract_usage,
     format_feedback_history,
-    state_text,
     summarize_state,
 )
 
 logger = logging.getLogger(__name__)
 
+# Output headings, in display order. Shared with the structured-delegation
+# summary so both paths read the same.
+_SECTION_HEADINGS = (
+    ("subtasks", "📋 Subtasks:"),
+    ("assignments", "\n👥 Agent Assignments:"),
+    ("integration", "\n🔄 Integration Plan:"),
+)
+_HEADING = dict(_SECTION_HEADINGS)
+# The lines of a reply that the parser acts on, stripped: headers ("**"/"#"),
+# list items (digit, "-", "*", "•"), and lines naming a section or an agent
+# assignment. A list item's marker is split off into `lead`, its text into
+# `body`.
+_REPLY_KEYWORDS = ("subtask", "assignment", "integration", "agent:", "assign to")
+_LIST_MARKERS = frozenset("0123456789-*•")
+_LEAD_CHARS = "0123456789.-*• "
+
+
+def _reply_lines(response: str) -> Iterator[tuple[str, str | None, str]]:
+    """(line, lead, body) for each line of `response` the parser acts on.
+
+    This was one multiline regex. Its lazy body followed by optional trailing
+    whitespace backtracked quadratically on a long run of spaces inside a
+    line: a 32k-character line took seven seconds. Stripping each line of
+    split('\n') output and lstrip()ing the marker is linear.
+    """
+    for line in response.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] in _LIST_MARKERS:
+            rest = line.lstrip(_LEAD_CHARS)
+            yield line, line[:len(line) - len(rest)], rest.lstrip()
+        elif line[0] == "#" or any(keyword in line.lower() for keyword in _REPLY_KEYWORDS):
+            yield line, None, line
+
+
+# VMPFC first: alternation is tried in order, and "MPFC" is a substring of it.
+_BRAIN_REGION_RE = re.compile(r"VMPFC|OFC|ACC|MPFC", re.IGNORECASE)
+# When a line names several regions, the first in this order wins -- not the
+# first mentioned.
+_BRAIN_REGIONS = ("VMPFC", "OFC", "ACC", "MPFC")
+
+
+def _brain_region(text: str) -> str | None:
+    """The highest-precedence brain region named in `text`, if any."""
+    named = {match.group().upper() for match in _BRAIN_REGION_RE.finditer(text)}
+    return next((region for region in _BRAIN_REGIONS if region in named), None)
+
+
+# Per-call context for both DLPFC prompts, sent after their fixed instructions.
+_DLPFC_CONTEXT = """Current Task: {task}
+Current State: {state}
+
+Previous Response (if any): {previous_response}
+User Feedback (if any): {feedback}
+
+Feedback History:
+{feedback_history}"""
+
 
 class AgentDelegation(BaseModel):
     """Schema-validated delegation decision.
@@ -75,22 +134,25 @@ class DLPFCAgent(BaseAgent):
         self._delegation_messages_cache: list[Any] | None = None
         self._last_usage: dict[str, Any] = {}
         self._structured_attempts = 0
+        # Whether the last decision was replayed from the response cache, and
+        # the similarity when it was a near-duplicate (semantic) hit.
+        self._delegation_cached = False
+        self._delegation_similarity: float | None = None
 
     def _create_prompt(self) -> ChatPromptTemplate:
-        template = """You are the Dorsolateral Prefrontal Cortex (DLPFC) Agent, responsible for:
+        """Free-text delegation prompt.
+
+        The fixed instructions go in a system message ahead of everything that
+        varies per call. They used to sit after the task and feedback, so no two
+        calls shared more than the opening line -- and providers only reuse work
+        for a shared prefix (OpenAI's prompt caching, Ollama's KV cache between
+        requests to a loaded model).
+        """
+        instructions = """You are the Dorsolateral Prefrontal Cortex (DLPFC) Agent, responsible for:
         1. Analyzing task requirements and complexity
         2. Intelligently selecting only the necessary specialized agents
         3. Delegating subtasks efficiently based on cognitive demands
 
-        Current Task: {task}
-        Current State: {state}
-
-        Previous Response (if any): {previous_response}
-        User Feedback (if any): {feedback}
-
-        Feedback History:
-        {feedback_history}
-
         IMPORTANT: Only delegate to agents that are actually needed for this specific task.
 
         Available specialized brain region agents:
@@ -115,7 +177,7 @@ class DLPFCAgent(BaseAgent):
 
         Then provide your analysis and subtask breakdown.
         """
-        return ChatPromptTemplate.from_template(template)
+        return ChatPromptTemplate.from_messages([("system", instructions), ("human", _DLPFC_CONTEXT)])
 
     def _create_delegation_prompt(self) -> ChatPromptTemplate:
         """Prompt for the schema-constrained delegation call.
@@ -123,20 +185,12 @@ class DLPFCAgent(BaseAgent):
         Deliberately shorter than the free-text prompt: the output shape is
         enforced by the schema, so none of the "REQUIRED FORMAT" scaffolding is
         needed and the model can spend its attention on the actual decision.
+        Split into fixed instructions and per-call context like _create_prompt.
         """
-        template = """You are the Dorsolateral Prefrontal Cortex (DLPFC) Agent, the central
+        instructions = """You are the Dorsolateral Prefrontal Cortex (DLPFC) Agent, the central
         controller of a brain-inspired multi-agent system. Decide which specialized
         agents this task actually requires, and break the task into subtasks.
 
-        Current Task: {task}
-        Current State: {state}
-
-        Previous Response (if any): {previous_response}
-        User Feedback (if any): {feedback}
-
-        Feedback History:
-        {feedback_history}
-
         Select ONLY the specialists this specific task needs -- do not select all of
         them by default:
         - VMPFC: emotions, social situations, risk assessment, moral decisions
@@ -146,16 +200,7 @@ class DLPFCAgent(BaseAgent):
         The MPFC agent always performs the final integration, so it is not your
         choice to make. A simple factual question may need no specialists at all.
         """
-        return ChatPromptTemplate.from_template(template)
-
-    def _delegation_messages(self, state: Mapping[str, Any]):
-        return self._create_delegation_prompt().format_messages(
-            task=state.get("task", ""),
-            state=summarize_state(state),
-            previous_response=state_text(state, "previous_response", "No previous response"),
-            feedback=state_text(state, "feedback", "No feedback provided"),
-            feedback_history=self._format_feedback_history(state.get("feedback_history", [])),
-        )
+        return ChatPromptTemplate.from_messages([("system", instructions), ("human", _DLPFC_CONTEXT)])
 
     async def _delegate_structured(self, state: Mapping[str, Any]) -> AgentDelegation | None:
         """Ask for a schema-validated delegation decision.
@@ -168,6 +213,8 @@ class DLPFCAgent(BaseAgent):
         # Reset per-call observability state.
         self._delegation_messages_cache = None
         self._last_usage = {}
+        self._delegation_cached = False
+        self._delegation_similarity = None
 
         try:
             structured_llm = self.llm.with_structured_output(AgentDelegation)
@@ -187,16 +234,41 @@ class DLPFCAgent(BaseAgent):
             logger.warning("Structured output for DLPFC is not runnable; using text parsing")
             return None
 
-        messages = self._delegation_messages(state)
+        prompt = self._class_prompt("_delegation_prompt_template", self._create_delegation_prompt)
+        inputs = self.prompt_inputs(state, prompt)
+        messages = prompt.format_messages(**inputs)
         self._delegation_messages_cache = messages
+
+        # DLPFC runs first on every task and never went through the response
+        # cache, so re-running a task (or a near-identical one, with the
+        # semantic tier on) always paid for a fresh decision. The validated
+        # decision is cached, not the reply text, so a hit skips validation too.
+        key = vector = None
+        scope = f"{self.agent_name}:delegation|{self.model_descriptor()['model']}"
+        if is_cacheable(self.llm):
+            key = cache_key(
+                {**self.cache_identity(), "schema": AgentDelegation.__name__},
+                self._serialize_messages(messages),
+            )
+            hit = RESPONSE_CACHE.get(key)
+            if hit is None and SEMANTIC_CACHE.enabled:
+                scope, text = self.semantic_query(inputs, scope)
+                vector = await asyncio.to_thread(SEMANTIC_CACHE.embed, text)
+                semantic_hit = SEMANTIC_CACHE.get(scope, vector)
+                if semantic_hit is not None:
+                    hit, self._delegation_similarity = semantic_hit
+            if hit is not None:
+                logger.debug("DLPFC delegation served from the response cache")
+                self._delegation_cached = True
+                return hit.model_copy(deep=True)
+
         # This call bills tokens whether or not it validates. Count it so the
         # fallback's spend is attributable rather than invisible.
         self._structured_attempts += 1
 
         try:
-            result = await asyncio.wait_for(
-                LLMFactory.wrap_with_retry(structured_llm, self.model_config).ainvoke(messages),
-                timeout=self.llm_timeout,
+            result = await self._invoke(
+                messages, LLMFactory.wrap_with_retry(structured_llm, self.model_config)
             )
         except TimeoutError:
             raise
@@ -209,6 +281,9 @@ class DLPFCAgent(BaseAgent):
             logger.debug("Structured delegation returned %s; using text parsing", type(result).__name__)
             return None
 
+        if key:
+            RESPONSE_CACHE.put(key, result.model_copy(deep=True))
+            SEMANTIC_CACHE.put(scope, vector, result.model_copy(deep=True))
         return result
 
     def _result_from_delegation(self, delegation: AgentDelegation) -> dict[str, Any]:
@@ -221,9 +296,9 @@ class DLPFCAgent(BaseAgent):
 
         parts = []
         if delegation.subtasks:
-            parts.append("📋 Subtasks:")
+            parts.append(_HEADING["subtasks"])
             parts.extend(f"  • {s}" for s in delegation.subtasks)
-        parts.append("\n👥 Agent Assignments:")
+        parts.append(_HEADING["assignments"])
         parts.append(f"  • {', '.join(selected)}")
         if delegation.reasoning:
             parts.append(f"\n🧭 Reasoning:\n  {delegation.reasoning}")
@@ -234,6 +309,9 @@ class DLPFCAgent(BaseAgent):
             "response": delegation.model_dump_json(indent=2),
             "usage": self._last_usage,
             "path": "structured_output",
+            "cached": self._delegation_cached,
+            # Only set for a near-duplicate (semantic) hit.
+            "cache_similarity": self._delegation_similarity,
         }
 
         return {
@@ -247,7 +325,8 @@ class DLPFCAgent(BaseAgent):
             # Consumed directly by the router, so no text parsing happens at all.
             "delegated_agents": delegation.to_stages(),
             "delegation_source": "structured_output",
-            "raw_llm_response": copy.deepcopy(self.last_raw_response),
+            # Built fresh per call; shared rather than copied (see BaseAgent).
+            "raw_llm_response": self.last_raw_response,
         }
 
     async def process(self, state: Mapping[str, Any]) -> dict[str, Any]:
@@ -255,8 +334,10 @@ class DLPFCAgent(BaseAgent):
             # Log the compact summary rather than the whole state dict: the raw
             # state carries the full session log and feedback history, which is
             # both unreadable and needlessly sensitive now that logging is wired
-            # up to a real handler.
-            logger.debug("DLPFC Agent processing:\n%s", summarize_state(state))
+            # up to a real handler. Guarded: as an argument the summary was
+            # built on every call, even with DEBUG off.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("DLPFC Agent processing:\n%s", summarize_state(state))
 
             # Preferred path: let the provider constrain generation to the
             # delegation schema. Falls through to free-text parsing when the
@@ -266,22 +347,13 @@ class DLPFCAgent(BaseAgent):
                 logger.debug("Structured delegation: %s", delegation.to_stages())
                 return self._result_from_delegation(delegation)
 
-            # Get task breakdown from LLM. The inner timeout mirrors
+            # Get task breakdown from LLM. The inner timeout (via _invoke) mirrors
             # BaseAgent._process_with_timeout -- DLPFC overrides process() and so
             # used to bypass AGENT_LLM_TIMEOUT_SECONDS entirely, leaving the
             # "inner timeout fires before the outer node timeout" invariant
             # (asserted by two tests) vacuous for the one agent that always runs.
-            messages = self.prompt.format_messages(
-                task=state.get("task", ""),
-                state=summarize_state(state),
-                previous_response=state_text(state, "previous_response", "No previous response"),
-                feedback=state_text(state, "feedback", "No feedback provided"),
-                feedback_history=self._format_feedback_history(state.get("feedback_history", []))
-            )
-            response = await asyncio.wait_for(
-                self.invoker().ainvoke(messages),
-                timeout=self.llm_timeout,
-            )
+            messages = self.prompt.format_messages(**self.prompt_inputs(state))
+            response = await self._invoke(messages)
 
             logger.debug("DLPFC Agent received response: %s", response)
 
@@ -298,15 +370,15 @@ class DLPFCAgent(BaseAgent):
             }
 
             # Parse response and update state
-            updated_state = self._format_response(response.content)
-            subtasks = self._parse_subtasks(response.content)
+            updated_state, subtasks = self._parse_and_format(response.content)
 
             logger.debug("Parsed subtasks: %s", subtasks)
 
             updated_state.update({
                 "subtasks": subtasks,
                 "stage": "task_delegation",
-                "raw_llm_response": copy.deepcopy(self.last_raw_response),
+                # Built fresh per call; shared rather than copied (see BaseAgent).
+                "raw_llm_response": self.last_raw_response,
             })
 
             logger.debug("Updated state: %s", updated_state)
@@ -330,12 +402,23 @@ class DLPFCAgent(BaseAgent):
                 "error": True,
             }
 
-    def _parse_subtasks(self, response: str) -> list[dict[str, Any]]:
-        """Parse the response to extract subtasks and their assignments."""
-        logger.debug("Parsing subtasks from response: %s", response)
+    def _parse_and_format(self, response: str) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Build the formatted reply and the subtask list in one walk of it.
+
+        These were two methods, each scanning the whole reply and classifying
+        its lines again. Returns (the agent result with the formatted
+        response, the subtasks).
+        """
+        logger.debug("Parsing DLPFC response: %s", response)
+
+        sections: dict[str, list[str]] = {
+            "subtasks": [],
+            "assignments": [],
+            "integration": [],
+        }
 
         try:
-            lines = response.split('\n')
+            current_section = None
             subtasks = []
             current_category = None
             current_subtask = None
@@ -345,52 +428,57 @@ class DLPFCAgent(BaseAgent):
             # named "YES - reason" / "NO".
             in_delegation_block = False
 
-            # Standard brain region agent types
-            brain_region_agents = ["VMPFC", "OFC", "ACC", "MPFC"]
+            # Lines that matter to neither output are skipped (see _reply_lines).
+            for line, lead, body in _reply_lines(response):
+                is_header = line.startswith(('**', '#'))
+                lowered = line.lower()
 
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
+                # Sections of the formatted reply
+                if "subtask" in lowered:
+                    current_section = "subtasks"
+                elif "assignment" in lowered:
+                    current_section = "assignments"
+                elif "integration" in lowered:
+                    current_section = "integration"
+                elif is_header:
+                    # A markdown header that names no known section ends the
+                    # current one. Without this it fell through to the bullet
+                    # branch below (it starts with '*') and was emitted as a
+                    # content bullet -- e.g. "**Analysis:**" rendered as
+                    # "• Analysis:**" under the previous section's heading.
+                    current_section = None
+                # Add content to appropriate section
+                elif current_section and lead is not None:
+                    sections[current_section].append(body)
 
-                # Skip section headers and formatting
-                if line.startswith('**') or line.startswith('#'):
-                    in_delegation_block = 'delegation' in line.lower()
-                    if 'subtask' in line.lower():
+                # Subtasks and their assignments
+                if is_header:
+                    in_delegation_block = 'delegation' in lowered
+                    if 'subtask' in lowered:
                         current_category = 'subtask'
-                    elif 'integration' in line.lower():
+                    elif 'integration' in lowered:
                         current_category = 'integration'
                     continue
 
                 if in_delegation_block:
                     continue
 
-                # Look for actual tasks (bullet points or numbered items)
-                if line[0].isdigit() or line[0] in ['-', '*', '•']:
-                    # Clean up the task text
-                    task_text = line.lstrip('0123456789.-*• ').strip()
-                    # Remove markdown formatting
-                    task_text = task_text.replace('**', '').replace('*', '')
+                if lead is not None:
+                    # The list marker is already gone; drop any markdown emphasis
+                    task_text = body.replace('*', '')
 
-                    # Check for agent assignment in the same line
                     agent = None
-                    if " - Assign to " in task_text:
-                        task_parts = task_text.split(" - Assign to ")
-                        task_text = task_parts[0].strip()
-                        agent = task_parts[1].strip()
-                    elif ":" in task_text and any(
-                        brain_agent in task_text.split(":")[0].upper()
-                        for brain_agent in brain_region_agents
-                    ):
+                    task_part, sep, assignee = task_text.partition(" - Assign to ")
+                    if sep:
+                        task_text = task_part.strip()
+                        agent = assignee.strip()
+                    else:
                         # Handle format like "VMPFC: task description"
-                        agent_part = task_text.split(":")[0].strip().upper()
-                        task_text = ":".join(task_text.split(":")[1:]).strip()
-
-                        # Extract just the agent name
-                        for brain_agent in brain_region_agents:
-                            if brain_agent in agent_part:
-                                agent = f"{brain_agent} Agent"
-                                break
+                        agent_part, sep, rest = task_text.partition(":")
+                        region = _brain_region(agent_part) if sep else None
+                        if region:
+                            task_text = rest.strip()
+                            agent = f"{region} Agent"
 
                     if task_text:
                         current_subtask = {
@@ -401,21 +489,16 @@ class DLPFCAgent(BaseAgent):
                         subtasks.append(current_subtask)
 
                 # Look for agent assignments in following lines
-                elif current_subtask and ('agent:' in line.lower() or 'assign to' in line.lower()):
-                    if 'agent:' in line.lower():
-                        agent = line.split(':')[1].strip()
+                elif current_subtask and ("agent:" in lowered or "assign to" in lowered):
+                    if "agent:" in lowered:
+                        # The field after the first colon, e.g. "Agent: OFC".
+                        assignee = line.split(":")[1]
                     else:
-                        agent = line.split('assign to')[1].strip()
-
-                    # Ensure agent is one of the brain region agents
-                    agent_clean = agent.replace('**', '').replace('*', '')
-                    for brain_agent in brain_region_agents:
-                        if brain_agent in agent_clean.upper():
-                            current_subtask["agent"] = f"{brain_agent} Agent"
-                            break
-                    else:
-                        # Default to the most appropriate agent if none specified
-                        current_subtask["agent"] = "MPFC Agent"
+                        assignee = line[lowered.index("assign to") + len("assign to"):]
+                    # Ensure agent is one of the brain region agents, defaulting
+                    # to the integrator when none is named
+                    region = _brain_region(assignee)
+                    current_subtask["agent"] = f"{region} Agent" if region else "MPFC Agent"
 
             # Filter out any empty or invalid tasks
             subtasks = [
@@ -430,65 +513,12 @@ class DLPFCAgent(BaseAgent):
                 if not task['agent']:
                     task['agent'] = "MPFC Agent"
 
-            return subtasks
-
-        except Exception as e:
-            logger.exception("Error parsing subtasks: %s", e)
-            return [{"task": "Error parsing subtasks", "agent": "MPFC Agent", "category": "error"}]
-
-    def _format_response(self, response: str) -> dict[str, Any]:
-        """Format the response from the LLM into a structured output."""
-        sections: dict[str, list[str]] = {
-            "subtasks": [],
-            "assignments": [],
-            "integration": [],
-        }
-
-        try:
-            current_section = None
-            lines = response.split('\n')
-
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                is_header = line.startswith('**') or line.startswith('#')
-
-                # Identify sections
-                if "subtask" in line.lower():
-                    current_section = "subtasks"
-                elif "assignment" in line.lower():
-                    current_section = "assignments"
-                elif "integration" in line.lower():
-                    current_section = "integration"
-                elif is_header:
-                    # A markdown header that names no known section ends the
-                    # current one. Without this it fell through to the bullet
-                    # branch below (it starts with '*') and was emitted as a
-                    # content bullet -- e.g. "**Analysis:**" rendered as
-                    # "• Analysis:**" under the previous section's heading.
-                    current_section = None
-                # Add content to appropriate section
-                elif (line[0].isdigit() or line[0] in ['-', '*', '•']) and current_section:
-                    sections[current_section].append(line.lstrip('0123456789.-*• ').strip())
-
             # Format the response in a more readable way
             formatted_response = []
-            if sections["subtasks"]:
-                formatted_response.append("📋 Subtasks:")
-                for task in sections["subtasks"]:
-                    formatted_response.append(f"  • {task}")
-
-            if sections["assignments"]:
-                formatted_response.append("\n👥 Agent Assignments:")
-                for assignment in sections["assignments"]:
-                    formatted_response.append(f"  • {assignment}")
-
-            if sections["integration"]:
-                formatted_response.append("\n🔄 Integration Plan:")
-                for step in sections["integration"]:
-                    formatted_response.append(f"  • {step}")
+            for section, heading in _SECTION_HEADINGS:
+                if sections[section]:
+                    formatted_response.append(heading)
+                    formatted_response.extend(f"  • {item}" for item in sections[section])
 
             # Create structured response in JSON format. If none of the expected
             # sections were found, fall back to the raw reply rather than
@@ -500,21 +530,26 @@ class DLPFCAgent(BaseAgent):
                 "content": response_text
             }
 
-            return {
-                "response": structured_response,
-                "error": False
-            }
+            return {"response": structured_response, "error": False}, subtasks
 
         except Exception as e:
-            logger.exception("Error formatting DLPFC response")
+            logger.exception("Error parsing DLPFC response")
             structured_error = {
                 "role": "assistant",
                 "content": str(e)
             }
-            return {
-                "response": structured_error,
-                "error": True
-            }
+            return (
+                {"response": structured_error, "error": True},
+                [{"task": "Error parsing subtasks", "agent": "MPFC Agent", "category": "error"}],
+            )
+
+    def _parse_subtasks(self, response: str) -> list[dict[str, Any]]:
+        """Parse the response to extract subtasks and their assignments."""
+        return self._parse_and_format(response)[1]
+
+    def _format_response(self, response: str) -> dict[str, Any]:
+        """Format the response from the LLM into a structured output."""
+        return self._parse_and_format(response)[0]
 
     def _format_feedback_history(self, history: list[dict[str, str]]) -> str:
         """Format feedback history for HITL integration into agent prompts.
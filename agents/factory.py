@@ -1,10 +1,71 @@
+import asyncio
+import json
 import logging
 import os
+import sys
+import weakref
 from typing import Any
 
+from langchain_core.runnables.retry import ExponentialJitterParams
+
 logger = logging.getLogger(__name__)
 
 
+# Exponential backoff between retries: 1s, 2s, 4s... plus up to 1s of jitter,
+# never more than 8s. Every attempt shares the agent's single timeout budget.
+# (The first wait keeps tenacity's 1s default: langchain-core only forwards
+# `initial`, which current tenacity deprecates.)
+RETRY_BACKOFF: ExponentialJitterParams = {"max": 8.0, "jitter": 1.0}
+
+
+def transient_errors() -> tuple[type[BaseException], ...]:
+    """Exception types that say the connection failed or stalled.
+
+    Covers the builtin ConnectionError the Ollama client raises when the server
+    is unreachable, socket-level OSErrors, httpx transport errors (read
+    timeouts, dropped connections), and the OpenAI client's connection and
+    timeout errors, which wrap the httpx ones. An HTTP error status is not a
+    type of its own; see is_transient.
+    """
+    errors: list[type[BaseException]] = [OSError, TimeoutError]
+    try:
+        import httpx
+    except ImportError:  # pragma: no cover - a langchain-core dependency
+        pass
+    else:
+        errors.append(httpx.TransportError)
+    # Not imported here: if nothing has loaded the OpenAI client, none of its
+    # errors can have been raised.
+    openai = sys.modules.get("openai")
+    if openai is not None:
+        errors.append(openai.APIConnectionError)
+    return tuple(errors)
+
+
+def _status_code(error: BaseException) -> int | None:
+    """The HTTP status a provider error carries, if any.
+
+    ollama.ResponseError and openai.APIStatusError carry it as `status_code`,
+    httpx.HTTPStatusError on its `response`.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient(error: BaseException) -> bool:
+    """True when sending the same request again may succeed.
+
+    That is a transport failure (transient_errors), a rate limit (429) or a
+    server error (5xx). Any other 4xx will be answered the same way again.
+    """
+    if isinstance(error, transient_errors()):
+        return True
+    status = _status_code(error)
+    return status is not None and (status == 429 or status >= 500)
+
+
 class LLMFactory:
     """Factory for creating LLM instances based on configuration.
 
@@ -16,6 +77,38 @@ class LLMFactory:
     just to start the app.
     """
 
+    # Constructed models, per event loop and then per config. See shared_llm.
+    _instances: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]] = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def shared_llm(cls, config: dict[str, Any]) -> Any:
+        """A model for `config`, reused by every agent that resolves to it.
+
+        Agents are rebuilt for every stage of every run, and each one used to
+        construct its own model -- and with it its own HTTP client and
+        connection pool (ChatOllama opens a fresh one per instance), so no
+        stage ever reused a warm connection.
+
+        Scoped to the running event loop: an async HTTP client is bound to the
+        loop it first ran on and cannot be reused after that loop closes. With
+        no loop running, a fresh model is returned.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return cls.create_llm(config)
+
+        key = json.dumps(config or {}, sort_keys=True, default=str)
+        models = cls._instances.setdefault(loop, {})
+        if key not in models:
+            models[key] = cls.create_llm(config)
+        return models[key]
+
+    @classmethod
+    def clear_shared(cls) -> None:
+        """Drop every shared model (tests that patch provider classes)."""
+        cls._instances.clear()
+
     @staticmethod
     def wrap_with_retry(runnable: Any, config: dict[str, Any]) -> Any:
         """Wrap a runnable in retry-with-exponential-backoff.
@@ -35,6 +128,14 @@ class LLMFactory:
         OpenAI is skipped because its client already retries natively (with
         rate-limit awareness); wrapping it too would multiply the attempts.
         Set `max_retries: 0` to disable.
+
+        Only transient failures are retried (is_transient): transport errors,
+        rate limits and server errors. `.with_retry()` defaults to every
+        Exception, so a bad model name, a rejected request or a validation error
+        was sent again `max_retries` times -- each attempt a guaranteed failure,
+        all of it spent from the same timeout budget. Backoff is capped so the
+        waits fit inside that budget, and jittered so agents that failed
+        together do not retry in lockstep.
         """
         if (config or {}).get("provider", "openai").lower() == "openai":
             return runnable
@@ -43,12 +144,19 @@ class LLMFactory:
         if not attempts or attempts < 1:
             return runnable
 
+        policy: dict[str, Any] = {
+            # `attempts` counts RETRIES, so add the initial try.
+            "stop_after_attempt": attempts + 1,
+            "wait_exponential_jitter": True,
+            "exponential_jitter_params": RETRY_BACKOFF,
+        }
         try:
-            return runnable.with_retry(
-                # `attempts` counts RETRIES, so add the initial try.
-                stop_after_attempt=attempts + 1,
-                wait_exponential_jitter=True,
-            )
+            try:
+                return runnable.with_retry(retry_if_exception_type=is_transient, **policy)
+            except (TypeError, ValueError):
+                # langchain-core releases whose with_retry takes exception types
+                # only: retry transport failures, not 429/5xx.
+                return runnable.with_retry(retry_if_exception_type=transient_errors(), **policy)
         except Exception as e:
             # Any object that is not a full LangChain Runnable. Retrying is a
             # nice-to-have; returning something unusable here would break the
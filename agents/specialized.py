@@ -18,7 +18,11 @@ from langchain_core.prompts import ChatPromptTemplate
 from .base import BaseAgent
 
 # Shared context block. Every specialist receives the same inputs; only the role
-# and the analysis instructions differ.
+# and the analysis instructions differ. It is sent as the human message, after
+# the instructions: those are fixed per specialist, and a prompt whose first
+# message is byte-identical across calls is what provider prefix caching
+# matches on. With the context spliced into the middle, every call differed
+# from the first few lines on.
 _CONTEXT = """Task: {task}
 Current State: {state}
 Previous Response: {previous_response}
@@ -33,8 +37,6 @@ say so briefly rather than manufacturing relevance."""
 VMPFC_PROMPT = f"""You are the VMPFC (ventromedial prefrontal cortex) agent. You assess the
 emotional, social, and risk dimensions of a decision.
 
-{_CONTEXT}
-
 Analyze:
 1. Emotional stakes -- what the person stands to feel, not just gain or lose.
 2. Social and relational consequences, including effects on people not present.
@@ -50,8 +52,6 @@ framing of the task appears to be avoiding or understating.
 OFC_PROMPT = f"""You are the OFC (orbitofrontal cortex) agent. You evaluate rewards, costs,
 and expected outcomes.
 
-{_CONTEXT}
-
 Analyze:
 1. Concrete benefits of each option, and their time horizon.
 2. Concrete costs, including opportunity cost and costs that are easy to miss.
@@ -67,8 +67,6 @@ inflate precision you do not have.
 ACC_PROMPT = f"""You are the ACC (anterior cingulate cortex) agent. You detect conflict,
 contradiction, and error.
 
-{_CONTEXT}
-
 Analyze:
 1. Goals stated or implied in the task that cannot all be satisfied at once.
 2. Contradictions between what is said and what is done or assumed.
@@ -83,13 +81,8 @@ rather than gesturing at complexity. If you find none, say so directly.
 
 MPFC_PROMPT = """You are the MPFC (medial prefrontal cortex) agent -- the integration stage.
 The other agents have already analyzed this task and their findings are in
-'Current State' below. Your job is to synthesize them into one recommendation.
-
-Task: {task}
-Current State: {state}
-Previous Response: {previous_response}
-Feedback: {feedback}
-Feedback History: {feedback_history}
+'Current State' in the message that follows. Your job is to synthesize them
+into one recommendation.
 
 Produce:
 1. RECOMMENDATION -- a clear position, stated first. Not a list of options.
@@ -128,7 +121,7 @@ def _build_agent(name: str, doc: str, env_key: str, template: str) -> type:
         BaseAgent.__init__(self, agent_name=_name, model_env_key=_env)
 
     def _create_prompt(self, _template=template) -> ChatPromptTemplate:
-        return ChatPromptTemplate.from_template(_template)
+        return ChatPromptTemplate.from_messages([("system", _template), ("human", _CONTEXT)])
 
     return type(f"{name}Agent", (BaseAgent,), {
         "__doc__": doc,
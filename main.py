@@ -1,18 +1,29 @@
 import asyncio
+import atexit
+import contextlib
 import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from dotenv import load_dotenv
 from langgraph.errors import GraphRecursionError
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - present wherever langsmith is
+    orjson = None  # type: ignore[assignment]
+
 from utils.config import ConfigLoader
+from utils.env import load_env
+from utils.loop import loop_factory
 from workflow import _response_content, create_workflow, process_hitl_feedback
 
 # Ensure Unicode output works on Windows consoles where stdout may default to cp1252.
@@ -26,7 +37,7 @@ except Exception:
     pass
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # Persistent state locations.
 #
@@ -37,7 +48,9 @@ load_dotenv()
 # ._config_path); this matches it. SCANUE_STATE_DIR overrides the root.
 PROJECT_ROOT = Path(__file__).resolve().parent
 STATE_DIR = Path(os.getenv("SCANUE_STATE_DIR", PROJECT_ROOT))
-FEEDBACK_HISTORY_FILE = str(STATE_DIR / "feedback_history.json")
+FEEDBACK_HISTORY_FILE = str(STATE_DIR / "feedback_history.jsonl")
+# Written by earlier versions as one JSON list; read until the first new entry.
+LEGACY_FEEDBACK_HISTORY_FILE = str(STATE_DIR / "feedback_history.json")
 LOGS_DIRECTORY = str(STATE_DIR / "logs")
 
 # Keep the most recent N session logs; older ones are pruned after each run.
@@ -56,50 +69,146 @@ def configure_logging() -> None:
     including genuine failures such as a model that could not be constructed.
     Level is taken from SCANUE_LOG_LEVEL (default WARNING); an unrecognized value
     falls back to WARNING rather than crashing at startup.
+
+    Records go through a queue to a listener thread that does the writing, so
+    at DEBUG -- where every prompt and response is logged -- a slow terminal
+    never blocks the event loop mid-run. Like basicConfig, this does nothing if
+    the root logger already has handlers.
     """
+    global _log_listener
+
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
     level = logging.getLevelName(os.getenv("SCANUE_LOG_LEVEL", "WARNING").upper())
     if not isinstance(level, int):
         level = logging.WARNING
 
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-        stream=sys.stderr,
-    )
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(log_queue, stderr_handler)
+    _log_listener.start()
+    atexit.register(_stop_log_listener)
+
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+
+_log_listener: logging.handlers.QueueListener | None = None
+
+
+def _stop_log_listener() -> None:
+    """Flush queued records at exit; the listener thread is a daemon."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
 
 def load_feedback_history():
-    """Load persistent feedback history from JSON file for HITL integration.
+    """Load persistent feedback history for HITL integration.
 
     This function enables Human-in-the-Loop functionality by loading previously
     collected user feedback that informs agent processing in future sessions.
     The feedback history provides context about user preferences and system performance.
 
+    History is stored one JSON object per line (see `save_feedback_entry`). A
+    `feedback_history.json` list written by earlier versions is still read
+    when no JSONL file exists yet; the first new entry migrates it. A line
+    that does not parse -- a write torn by a crash -- is skipped rather than
+    costing the whole history.
+
     Returns:
         list: Historical feedback entries with response, feedback, and stage information
     """
     try:
-        if os.path.exists(FEEDBACK_HISTORY_FILE):
-            with open(FEEDBACK_HISTORY_FILE) as f:
-                return json.load(f)
-        return []
+        try:
+            with open(FEEDBACK_HISTORY_FILE, "rb") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return _load_legacy_feedback_history()
+        history = []
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                history.append(_loads(line))
+            except ValueError:
+                logger.warning("Skipping unreadable feedback entry on line %d of %s", number, FEEDBACK_HISTORY_FILE)
+        return history
     except Exception as e:
         print(f"Warning: Could not load feedback history: {str(e)}")
         return []
 
+def _load_legacy_feedback_history() -> list[Any]:
+    """The pre-JSONL history: a single JSON list, or [] if there is none."""
+    try:
+        with open(LEGACY_FEEDBACK_HISTORY_FILE, "rb") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+def _feedback_line(entry: Any) -> bytes:
+    """One history entry as a JSONL line; non-JSON values are stringified."""
+    if orjson is not None:
+        # TypeError: integers past 64 bits, for one; the stdlib handles them.
+        with contextlib.suppress(TypeError):
+            return orjson.dumps(entry, default=str) + b"\n"
+    return (json.dumps(entry, default=str) + "\n").encode()
+
+def _loads(line: bytes) -> Any:
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+def _migrated_legacy_feedback() -> bytes:
+    """The legacy history as JSONL lines; nothing if it cannot be read.
+
+    A corrupt legacy file used to fail every save, so no new feedback was kept
+    at all. It is left in place for the user to recover by hand.
+    """
+    try:
+        return b"".join(_feedback_line(old) for old in _load_legacy_feedback_history())
+    except (OSError, ValueError) as e:
+        logger.warning("Not migrating unreadable %s (%s); it is left as it is", LEGACY_FEEDBACK_HISTORY_FILE, e)
+        return b""
+
+def save_feedback_entry(entry):
+    """Append one feedback entry to the persistent history.
+
+    Saving used to rewrite the whole history file for every new piece of
+    feedback, so each save cost O(history) in serialization and disk writes.
+    The history is append-only -- entries are never edited -- so a new entry
+    is now one line appended to a JSONL file. If only a legacy
+    `feedback_history.json` exists, its entries are carried over first
+    (unless it does not parse; the new entry is saved either way).
+
+    Args:
+        entry: The feedback entry to persist
+    """
+    try:
+        # Serialize first so a failure cannot leave a partial line behind.
+        payload = _feedback_line(entry)
+        if not os.path.exists(FEEDBACK_HISTORY_FILE):
+            payload = _migrated_legacy_feedback() + payload
+        with open(FEEDBACK_HISTORY_FILE, "ab") as f:
+            f.write(payload)
+    except Exception as e:
+        logger.warning("Could not save feedback history: %s", e)
+        print(f"Warning: Could not save feedback history: {str(e)}")
+
 def save_feedback_history(feedback_history):
-    """Persist feedback history to JSON file for cross-session HITL continuity.
+    """Persist a complete feedback history, replacing what is on disk.
 
-    This function ensures that user feedback is maintained across application
-    sessions, enabling the system to learn from previous interactions and
-    continuously improve its responses based on accumulated user preferences.
+    The CLI appends with `save_feedback_entry`; this is for rewriting the
+    history wholesale (pruning it, or seeding a state directory).
 
     Args:
         feedback_history: List of feedback entries to persist
     """
     try:
         # Serialize first so a failure cannot truncate an existing history file.
-        payload = json.dumps(feedback_history, default=str)
-        with open(FEEDBACK_HISTORY_FILE, 'w', encoding='utf-8') as f:
+        payload = b"".join(_feedback_line(entry) for entry in feedback_history)
+        with open(FEEDBACK_HISTORY_FILE, "wb") as f:
             f.write(payload)
     except Exception as e:
         logger.warning("Could not save feedback history: %s", e)
@@ -181,6 +290,21 @@ def create_session_log(task: str) -> dict[str, Any]:
         "completed": False               # Whether workflow completed successfully
     }
 
+def _session_log_bytes(session_log: dict[str, Any]) -> bytes:
+    """The session log as indented JSON.
+
+    Every stage carries its full prompt and reply, so this is the largest
+    thing the CLI serializes; orjson encodes it several times faster than the
+    stdlib and produces UTF-8 bytes directly.
+    """
+    if orjson is not None:
+        # TypeError: integers past 64 bits, for one; the stdlib handles them.
+        with contextlib.suppress(TypeError):
+            return orjson.dumps(
+                session_log, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+    return json.dumps(session_log, indent=2, default=str).encode()
+
 def save_session_log(session_log: dict[str, Any]) -> str | None:
     """Save the session log to a JSON file and return the filename."""
     try:
@@ -199,9 +323,9 @@ def save_session_log(session_log: dict[str, Any]) -> str | None:
         # raw_llm_response, say) raised partway through and left a truncated,
         # unparseable file behind while this function reported failure.
         # `default=str` keeps an unexpected value from destroying the whole log.
-        payload = json.dumps(session_log, indent=2, default=str)
+        payload = _session_log_bytes(session_log)
 
-        with open(filename, 'w', encoding='utf-8') as f:
+        with open(filename, 'wb') as f:
             f.write(payload)
 
         _prune_old_logs()
@@ -211,6 +335,42 @@ def save_session_log(session_log: dict[str, Any]) -> str | None:
         print(f"Warning: Could not save session log: {str(e)}")
         return None
 
+async def _ainput() -> str:
+    """`input()` without blocking the event loop.
+
+    main() is a coroutine, but every prompt called input() directly, so the
+    loop stood still for as long as the user took to type -- nothing else
+    scheduled on it could run. The read happens on a daemon thread instead:
+    not asyncio.to_thread, whose executor is joined at shutdown, so a Ctrl+C
+    at the prompt would then hang until the user pressed Enter.
+    """
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future[str] = loop.create_future()
+
+    def settle(line: str | None, error: BaseException | None) -> None:
+        if future.done():  # cancelled while the user was typing
+            return
+        if isinstance(error, StopIteration):
+            # A future refuses StopIteration; it would never settle.
+            error = RuntimeError(f"input() raised {error!r}")
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(line or "")
+
+    def read() -> None:
+        # BaseException: a KeyboardInterrupt here must still wake the awaiting
+        # coroutine, or main() would wait on this future forever.
+        try:
+            line = input()
+        except BaseException as e:
+            loop.call_soon_threadsafe(settle, None, e)
+        else:
+            loop.call_soon_threadsafe(settle, line, None)
+
+    threading.Thread(target=read, name="scanue-input", daemon=True).start()
+    return await future
+
 async def main(args=None):
     """Main entry point for the application."""
     configure_logging()
@@ -274,7 +434,7 @@ async def main(args=None):
             else:
                 print("Please describe your task or issue:")
                 print(">")
-                task = input().strip()
+                task = (await _ainput()).strip()
 
             if not task:
                 print("❌ Task cannot be empty. Please try again.")
@@ -304,7 +464,10 @@ async def main(args=None):
                 "subtasks": [],
                 "feedback": "",
                 "previous_response": "",
-                "feedback_history": feedback_history.copy(),  # HITL: Historical user feedback
+                # HITL: Historical user feedback. Shared, not copied: the list
+                # grows with every session, nothing in the graph mutates it, and
+                # process_hitl_feedback returns a new one rather than appending.
+                "feedback_history": feedback_history,
                 "session_log": session_log,          # Comprehensive execution tracking
                 "completed_stages": [],              # Stages that have finished (router state)
                 "error": False
@@ -386,11 +549,11 @@ async def main(args=None):
                 # Non-interactive runs (args provided) should never block on stdin.
                 if interactive:
                     print("\n📝 Would you like to provide feedback? (y/n)")
-                    feedback_choice = input().strip().lower()
+                    feedback_choice = (await _ainput()).strip().lower()
 
                     if feedback_choice == "y":
                         print("Please provide your feedback:")
-                        feedback = input().strip()
+                        feedback = (await _ainput()).strip()
                         if feedback:
                             print("\n🔄 Processing your feedback...")
                             # PERSISTENT LEARNING: Add feedback to cross-session history
@@ -413,8 +576,8 @@ async def main(args=None):
                             feedback_history = feedback_state["feedback_history"]
                             session_log = feedback_state["session_log"]
 
-                            # PERSISTENCE: Save updated feedback history to file for future sessions
-                            save_feedback_history(feedback_history)
+                            # PERSISTENCE: Append the new entry for future sessions
+                            save_feedback_entry(feedback_history[-1])
 
                             print("\n✅ Feedback stored for future queries.")
 
@@ -482,7 +645,13 @@ async def main(args=None):
 def cli() -> None:
     """Synchronous entry point for the `scanue` console script."""
     # Pass CLI args through so one-shot mode (`scanue "task"`) works.
-    asyncio.run(main(sys.argv[1:]))
+    try:
+        with asyncio.Runner(loop_factory=loop_factory()) as runner:
+            runner.run(main(sys.argv[1:]))
+    except KeyboardInterrupt:
+        # Ctrl+C at a prompt cancels main() at its await, so asyncio.run
+        # raises the interrupt here rather than inside main().
+        print("\n\n👋 SCANUE-V processing interrupted. Goodbye!")
 
 
 if __name__ == "__main__":
@@ -14,7 +14,7 @@ one real task and checks the things stubs cannot prove --
   * whether any response was truncated mid-generation
   * how much context headroom the largest prompt leaves
 
-It writes to a temporary state directory, so your real feedback_history.json
+It writes to a temporary state directory, so your real feedback_history.jsonl
 and logs/ are untouched.
 
 Usage:
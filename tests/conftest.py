@@ -4,10 +4,16 @@
 `TEST_CONFIG` in two; the shared ones live here.
 """
 
+import asyncio
+
 import pytest
 from dotenv import load_dotenv
 
+from agents.breaker import reset_breakers
+from agents.cache import RESPONSE_CACHE, SEMANTIC_CACHE
+from agents.factory import LLMFactory
 from utils.config import ConfigLoader
+from utils.loop import loop_factory
 
 # A config where every agent uses a cheap, offline-safe OpenAI stub. Individual
 # modules override this when they need provider-specific behaviour.
@@ -20,21 +26,42 @@ TEST_CONFIG = {
 }
 
 
-@pytest.fixture(autouse=True)
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on the loop the CLI runs on.
+
+    That is uvloop when the `fast` extra is installed (utils.loop).
+    The suite's async tests are all mocks, so they are bound by the loop's
+    per-callback overhead. pytest-asyncio releases without this hook ignore
+    it.
+    """
+    factory = loop_factory()
+    return {"uvloop": factory} if factory else {"asyncio": asyncio.new_event_loop}
+
+
+@pytest.fixture(autouse=True, scope="session")
 def load_env():
-    """Load environment variables before each test"""
+    """Load environment variables once for the session.
+
+    This called load_dotenv() before every test, and each call searched the
+    directory tree for a .env file again. Nothing in the suite edits .env, and
+    every test that changes the environment restores it, so once is enough.
+    """
     load_dotenv()
 
 
-@pytest.fixture(autouse=True)
-def mock_openai_key(monkeypatch):
+@pytest.fixture(autouse=True, scope="session")
+def mock_openai_key():
     """Ensure OPENAI_API_KEY is available for tests.
 
-    Uses monkeypatch rather than assigning os.environ directly: the previous
+    Uses a MonkeyPatch rather than assigning os.environ directly: the previous
     version permanently mutated the process environment for the whole session
-    with no teardown, unlike every other env fixture in the suite.
+    with no teardown, unlike every other env fixture in the suite. Tests that
+    remove the key do so through their own monkeypatch, which puts it back.
     """
-    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("OPENAI_API_KEY", "test-key")
+        yield
 
 
 @pytest.fixture(autouse=True)
@@ -47,3 +74,41 @@ def reset_config_cache():
     ConfigLoader.reset()
     yield
     ConfigLoader.reset()
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_models():
+    """Drop models shared through LLMFactory.shared_llm.
+
+    Tests patch provider classes; a model built under one test's patch must not
+    be handed to the next.
+    """
+    LLMFactory.clear_shared()
+    yield
+    LLMFactory.clear_shared()
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Empty the shared LLM response caches around each test.
+
+    It is process-wide by design, so a reply cached by one test would otherwise
+    be served to the next one that renders the same prompt.
+    """
+    RESPONSE_CACHE.clear()
+    SEMANTIC_CACHE.clear()
+    yield
+    RESPONSE_CACHE.clear()
+    SEMANTIC_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Close every circuit breaker around each test.
+
+    Breakers are shared per model, so the timeout and connection-failure tests
+    would otherwise open one and fail every later test using that model fast.
+    """
+    reset_breakers()
+    yield
+    reset_breakers()
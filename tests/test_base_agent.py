@@ -5,7 +5,13 @@ from unittest.mock import AsyncMock, patch
 import pytest
 from langchain_core.prompts import ChatPromptTemplate
 
-from agents.base import AGENT_LLM_TIMEOUT_SECONDS, BaseAgent, state_text, summarize_state
+from agents.base import (
+    AGENT_LLM_TIMEOUT_SECONDS,
+    PROMPT_INPUTS,
+    BaseAgent,
+    state_text,
+    summarize_state,
+)
 from workflow import NODE_TIMEOUT_SECONDS
 
 
@@ -154,6 +160,22 @@ async def test_empty_feedback_history_renders_placeholder(mock_env_vars):
     assert "No previous feedback" in prompt_text
 
 
+@pytest.mark.asyncio
+async def test_only_the_variables_a_template_uses_are_built(test_agent, test_state):
+    """The state summary and feedback history were rendered for every prompt,
+    including ones (like this agent's) with no slot for them."""
+    mock_response = AsyncMock()
+    mock_response.content = "ok"
+    with patch("agents.base.PROMPT_INPUTS", {
+        **PROMPT_INPUTS,
+        "state": lambda state: pytest.fail("state summary built for a prompt without {state}"),
+    }), patch("langchain_openai.ChatOpenAI.ainvoke", new=AsyncMock(return_value=mock_response)):
+        result = await test_agent.process(test_state)
+
+    assert not result.get("error")
+    assert test_agent.prompt_inputs(test_state) == {"task": "test task"}
+
+
 def test_blank_fields_render_their_placeholder():
     """main.py seeds `feedback`/`previous_response` as empty strings, so the key
     is always PRESENT and `state.get(key, default)` could never fire -- prompts
@@ -191,3 +213,24 @@ def test_outer_node_timeout_exceeds_inner_llm_timeout():
     """C4 guard: the outer per-node timeout must stay strictly greater than the
     inner LLM timeout so they never race."""
     assert NODE_TIMEOUT_SECONDS > AGENT_LLM_TIMEOUT_SECONDS
+
+
+def test_prompt_is_built_once_per_agent_class(mock_env_vars):
+    """Agents are constructed for every stage of every run, and each one parsed
+    its fixed template again."""
+    built = []
+
+    class CountingAgent(TestAgent):
+        def _create_prompt(self):
+            built.append(type(self))
+            return ChatPromptTemplate.from_template("Counted: {task}")
+
+    class OtherAgent(CountingAgent):
+        pass
+
+    first, second = CountingAgent(), CountingAgent()
+    other = OtherAgent()
+
+    assert built == [CountingAgent, OtherAgent]
+    assert first.prompt is second.prompt
+    assert other.prompt is not first.prompt
@@ -0,0 +1,341 @@
+"""Tests for the deterministic LLM response cache.
+
+Every stage paid a provider round-trip even when a temperature-0 model was
+handed a prompt it had already answered in the same session.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+
+from agents.base import BaseAgent
+from agents.cache import IN_FLIGHT, RESPONSE_CACHE, ResponseCache, cache_key, is_cacheable
+
+
+def _config(temperature, **settings):
+    return {"agents": {"TEST": {"models": {"primary": {
+        "provider": "openai", "name": "test-model", "temperature": temperature, **settings,
+    }}}}}
+
+
+class CachedAgent(BaseAgent):
+    __test__ = False
+
+    def __init__(self):
+        super().__init__(agent_name="TEST")
+
+    def _create_prompt(self) -> ChatPromptTemplate:
+        return ChatPromptTemplate.from_template("Task: {task}")
+
+
+def _agent(temperature, **settings):
+    with patch("utils.config.ConfigLoader.load_config", return_value=_config(temperature, **settings)):
+        return CachedAgent()
+
+
+# --------------------------------------------------------------------------- #
+# ResponseCache
+# --------------------------------------------------------------------------- #
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2, ttl=60)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_expired_entries_are_not_served():
+    cache = ResponseCache(max_entries=8, ttl=60)
+    with patch("agents.cache.time.monotonic", return_value=0.0):
+        cache.put("k", "v")
+    with patch("agents.cache.time.monotonic", return_value=61.0):
+        assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = ResponseCache(max_entries=8, ttl=0)
+    cache.put("k", "v")
+    assert cache.get("k") is None
+
+
+def test_key_depends_on_model_and_prompt():
+    prompt = [{"type": "human", "content": "hi"}]
+    model = {"model": "m", "provider": "ollama"}
+
+    assert cache_key(model, prompt) == cache_key(dict(model), list(prompt))
+    assert cache_key(model, prompt) != cache_key({**model, "model": "other"}, prompt)
+    assert cache_key(model, prompt) != cache_key(model, [{"type": "human", "content": "hello"}])
+
+
+@pytest.mark.parametrize("encoder", ["orjson", "stdlib"])
+def test_key_is_stable_with_either_encoder(encoder):
+    """orjson is used when present; without it (or for values it rejects) the
+    stdlib encodes instead."""
+    prompt = [{"type": "human", "content": "hi", "n": 2**70}]
+    model = {"model": "m", "provider": "ollama"}
+    with patch("agents.cache.orjson", None if encoder == "stdlib" else pytest.importorskip("orjson")):
+        assert cache_key(model, prompt) == cache_key(dict(model), list(prompt))
+        assert cache_key(model, prompt) != cache_key(model, [{"type": "human", "content": "hello"}])
+
+
+def test_only_a_real_zero_temperature_is_cacheable():
+    assert is_cacheable(MagicMock(temperature=0))
+    assert is_cacheable(MagicMock(temperature=0.0))
+    assert not is_cacheable(MagicMock(temperature=0.7))
+    # A MagicMock attribute is a MagicMock, not a number.
+    assert not is_cacheable(MagicMock())
+
+
+# --------------------------------------------------------------------------- #
+# BaseAgent integration
+# --------------------------------------------------------------------------- #
+
+@pytest.mark.asyncio
+async def test_repeat_prompt_at_temperature_zero_skips_the_provider():
+    reply = MagicMock(content="cached answer", usage_metadata={"total_tokens": 12}, response_metadata={})
+    ainvoke = AsyncMock(return_value=reply)
+
+    with patch("langchain_openai.ChatOpenAI.ainvoke", new=ainvoke):
+        first = await _agent(0).process({"task": "same task"})
+        second = await _agent(0).process({"task": "same task"})
+
+    assert ainvoke.await_count == 1
+    assert second["response"]["content"] == first["response"]["content"] == "cached answer"
+    assert first["raw_llm_response"]["cached"] is False
+    assert second["raw_llm_response"]["cached"] is True
+    # A hit bills nothing, so it must not inflate the run's token totals.
+    assert second["raw_llm_response"]["usage"] == {}
+
+
+@pytest.mark.asyncio
+async def test_same_model_under_other_settings_is_not_served_from_the_cache():
+    """Keys held only the model name and provider, so a reply generated
+    under a tight max_tokens, or by another host, was served to the rest."""
+    ainvoke = AsyncMock(return_value=MagicMock(content="answer", usage_metadata={}, response_metadata={}))
+
+    with patch("langchain_openai.ChatOpenAI.ainvoke", new=ainvoke):
+        await _agent(0, max_tokens=50).process({"task": "same task"})
+        await _agent(0, max_tokens=4000).process({"task": "same task"})
+        await _agent(0, max_tokens=4000, base_url="http://other-host/v1").process({"task": "same task"})
+        await _agent(0, max_tokens=50).process({"task": "same task"})
+
+    assert ainvoke.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_sampling_temperature_is_never_cached():
+    ainvoke = AsyncMock(return_value=MagicMock(content="sample", usage_metadata={}, response_metadata={}))
+
+    with patch("langchain_openai.ChatOpenAI.ainvoke", new=ainvoke):
+        await _agent(0.7).process({"task": "same task"})
+        await _agent(0.7).process({"task": "same task"})
+
+    assert ainvoke.await_count == 2
+    assert len(RESPONSE_CACHE) == 0
+
+
+@pytest.mark.asyncio
+async def test_failures_and_truncated_replies_are_not_cached():
+    truncated = MagicMock(content="cut", usage_metadata={}, response_metadata={"finish_reason": "length"})
+
+    with patch("langchain_openai.ChatOpenAI.ainvoke", new=AsyncMock(side_effect=ConnectionError("down"))):
+        assert (await _agent(0).process({"task": "t"}))["error"]
+    with patch("langchain_openai.ChatOpenAI.ainvoke", new=AsyncMock(return_value=truncated)):
+        await _agent(0).process({"task": "t"})
+
+    assert len(RESPONSE_CACHE) == 0
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_request():
+    """Both missed the cache -- neither reply had come back yet -- and both
+    paid for generation."""
+    release = asyncio.Event()
+
+    async def slow(*args, **kwargs):
+        await release.wait()
+        return MagicMock(content="shared answer", usage_metadata={"total_tokens": 9}, response_metadata={})
+
+    ainvoke = AsyncMock(side_effect=slow)
+    with patch("langchain_openai.ChatOpenAI.ainvoke", new=ainvoke):
+        calls = [asyncio.create_task(_agent(0).process({"task": "same"})) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+
+    assert ainvoke.await_count == 1
+    assert [r["response"]["content"] for r in results] == ["shared answer"] * 3
+    assert [r["raw_llm_response"]["cached"] for r in results].count(False) == 1
+    assert len(IN_FLIGHT) == 0
+
+
+@pytest.mark.asyncio
+async def test_followers_see_the_shared_failure():
+    release = asyncio.Event()
+
+    async def down(*args, **kwargs):
+        await release.wait()
+        raise ConnectionError("down")
+
+    ainvoke = AsyncMock(side_effect=down)
+    with patch("langchain_openai.ChatOpenAI.ainvoke", new=ainvoke):
+        calls = [asyncio.create_task(_agent(0).process({"task": "same"})) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+
+    assert ainvoke.await_count == 1
+    assert all(r["error"] for r in results)
+    assert len(IN_FLIGHT) == 0
+
+
+# --------------------------------------------------------------------------- #
+# Semantic tier
+# --------------------------------------------------------------------------- #
+
+def _bag_of_words(text):
+    """Deterministic stand-in embedder: word counts over a tiny vocabulary."""
+    vocab = ("job", "offer", "pay", "hours", "team", "move", "city", "rent")
+    words = text.lower().split()
+    return [float(words.count(w)) for w in vocab]
+
+
+def test_near_duplicate_is_served_within_its_scope():
+    pytest.importorskip("numpy")
+    from agents.cache import SemanticCache
+
+    cache = SemanticCache(embed=_bag_of_words, threshold=0.95, enabled=True)
+    cache.put("VMPFC|m", cache.embed("job offer pay hours"), "answer")
+
+    hit = cache.get("VMPFC|m", cache.embed("job  offer pay   hours"))
+    assert hit is not None and hit[0] == "answer"
+    # Another agent's prompt never matches, however similar.
+    assert cache.get("OFC|m", cache.embed("job offer pay hours")) is None
+    # A different question is a miss.
+    assert cache.get("VMPFC|m", cache.embed("move city rent")) is None
+
+
+def test_semantic_tier_is_bounded():
+    pytest.importorskip("numpy")
+    from agents.cache import SemanticCache
+
+    cache = SemanticCache(embed=_bag_of_words, threshold=0.95, max_entries=2, enabled=True)
+    for text in ("job offer", "move city", "pay rent"):
+        cache.put("s", cache.embed(text), text)
+
+    assert len(cache) == 2
+    assert cache.get("s", cache.embed("job offer")) is None  # oldest was replaced
+
+
+def test_semantic_tier_disables_itself_without_its_dependencies():
+    from agents.cache import SemanticCache
+
+    cache = SemanticCache(enabled=True)
+    with patch.dict("sys.modules", {"fastembed": None}):
+        assert cache.embed("anything") is None
+    assert not cache.enabled
+
+
+@pytest.mark.asyncio
+async def test_agent_falls_back_to_the_semantic_tier():
+    pytest.importorskip("numpy")
+    from agents.cache import SemanticCache
+
+    semantic = SemanticCache(embed=_bag_of_words, threshold=0.95, enabled=True)
+    ainvoke = AsyncMock(return_value=MagicMock(content="first", usage_metadata={}, response_metadata={}))
+
+    with patch("agents.base.SEMANTIC_CACHE", semantic), \
+         patch("langchain_openai.ChatOpenAI.ainvoke", new=ainvoke):
+        await _agent(0).process({"task": "job offer pay hours"})
+        second = await _agent(0).process({"task": "job offer  pay hours"})
+
+    assert ainvoke.await_count == 1
+    assert second["response"]["content"] == "first"
+    assert second["raw_llm_response"]["cache_similarity"] > 0.95
+
+
+def _hashed_words(text):
+    """Stand-in embedder over every word, so fixed prompt text counts as it
+    would in a real sentence embedding."""
+    vector = [0.0] * 512
+    for word in text.lower().split():
+        vector[hash(word) % 512] += 1.0
+    return vector
+
+
+def _specialist(temperature):
+    from agents.specialized import VMPFCAgent
+
+    config = {"agents": {"VMPFC": {"models": {"primary": {"provider": "ollama", "name": "m"}}}}}
+    with patch("utils.config.ConfigLoader.load_config", return_value=config), \
+         patch("agents.factory.LLMFactory.create_llm",
+               return_value=MagicMock(model_name="m", temperature=temperature)):
+        agent = VMPFCAgent()
+    agent.llm.with_retry = MagicMock(return_value=agent.llm)
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_distinct_tasks_do_not_collide_behind_a_shared_prompt():
+    """The whole rendered prompt used to be embedded. A specialist prompt is
+    mostly fixed instructions and context, so two different questions cleared
+    the threshold and one was answered with the other's analysis."""
+    pytest.importorskip("numpy")
+    from agents.cache import SemanticCache
+
+    semantic = SemanticCache(embed=_hashed_words, threshold=0.97, enabled=True)
+    first_task = {"task": "Should I accept the job offer in Berlin?"}
+    second_task = {"task": "Is it worth refinancing my mortgage now?"}
+
+    # The premise: as whole prompts the two are near-duplicates.
+    agent = _specialist(0)
+    rendered = [
+        "\n".join(str(m.content) for m in agent.prompt.format_messages(**agent.prompt_inputs(state)))
+        for state in (first_task, second_task)
+    ]
+    assert float(semantic.embed(rendered[0]) @ semantic.embed(rendered[1])) > 0.97
+
+    replies = iter(["berlin analysis", "mortgage analysis"])
+    agent.llm.ainvoke = AsyncMock(side_effect=lambda messages: MagicMock(
+        content=next(replies), usage_metadata={}, response_metadata={},
+    ))
+    with patch("agents.base.SEMANTIC_CACHE", semantic):
+        await agent.process(first_task)
+        second = await agent.process(second_task)
+        rephrased = await agent.process({"task": "Should I  accept the job offer in Berlin?"})
+
+    assert second["response"]["content"] == "mortgage analysis"
+    assert agent.llm.ainvoke.await_count == 2
+    assert rephrased["raw_llm_response"]["cached"] is True
+
+
+@pytest.mark.asyncio
+async def test_semantic_lookup_does_not_open_a_window_for_duplicate_calls():
+    """The flight was registered only after the embedding was awaited, so two
+    identical concurrent calls both missed and both called the provider."""
+    pytest.importorskip("numpy")
+    from agents.cache import SemanticCache
+
+    semantic = SemanticCache(embed=_hashed_words, threshold=0.97, enabled=True)
+    agent = _specialist(0)
+
+    async def slow_reply(messages):
+        await asyncio.sleep(0.01)
+        return MagicMock(content="shared", usage_metadata={}, response_metadata={})
+
+    agent.llm.ainvoke = AsyncMock(side_effect=slow_reply)
+    with patch("agents.base.SEMANTIC_CACHE", semantic):
+        results = await asyncio.gather(*(agent.process({"task": "t"}) for _ in range(2)))
+
+    assert agent.llm.ainvoke.await_count == 1
+    assert [r["response"]["content"] for r in results] == ["shared", "shared"]
+    assert len(IN_FLIGHT) == 0
+
@@ -59,3 +59,31 @@ def test_get_agent_config_returns_a_deep_copy():
         got["models"]["primary"]["name"] = "mutated"
 
     assert config["agents"]["DLPFC"]["models"]["primary"]["name"] == "a"
+
+
+def test_dotenv_is_loaded_once_per_process(monkeypatch):
+    """main.py and agents/base.py each parsed .env again at import."""
+    from utils import env
+
+    env.load_env.cache_clear()
+    monkeypatch.delenv("SCANUE_SKIP_DOTENV", raising=False)
+    try:
+        with patch("utils.env.load_dotenv", return_value=True) as load:
+            env.load_env()
+            env.load_env()
+        load.assert_called_once()
+    finally:
+        env.load_env.cache_clear()
+
+
+def test_dotenv_can_be_skipped(monkeypatch):
+    from utils import env
+
+    env.load_env.cache_clear()
+    monkeypatch.setenv("SCANUE_SKIP_DOTENV", "1")
+    try:
+        with patch("utils.env.load_dotenv") as load:
+            assert env.load_env() is False
+        load.assert_not_called()
+    finally:
+        env.load_env.cache_clear()
@@ -136,3 +136,21 @@ def test_no_peer_insights_when_every_specialist_failed():
 def test_mpfc_is_not_its_own_peer():
     state = {"agent_responses": {"MPFC": {"content": "my own earlier output"}}, "agent_errors": {}}
     assert "previous_agent_insights" not in _prepare_value_assessment_state(state)
+
+
+def test_mpfc_input_is_layered_over_the_state_not_copied():
+    """The whole state -- session log included -- was deep-copied to add two
+    read-only keys for MPFC."""
+    import threading
+
+    state = {
+        "agent_responses": {"ACC": {"content": "ok"}},
+        "agent_errors": {"VMPFC": FAILURE_TEXT},
+        # Deep-copying a lock raises, so this fails if the state is copied.
+        "session_log": {"guard": threading.Lock()},
+    }
+    enriched = _prepare_value_assessment_state(state)
+
+    assert enriched["session_log"] is state["session_log"]
+    assert enriched["unavailable_agents"] == ["VMPFC"]
+    assert "unavailable_agents" not in state
@@ -1,4 +1,5 @@
 import asyncio
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -98,8 +99,8 @@ async def test_dlpfc_agent_error_handling(dlpfc_agent, test_state):
 async def test_dlpfc_agent_timeout(dlpfc_agent, test_state):
     """Test timeout handling in DLPFC agent"""
     async def mock_process(*args, **kwargs):
-        await asyncio.sleep(1)
-        return None
+        # Never set: blocks until cancelled, with no timer of its own.
+        await asyncio.Event().wait()
 
     dlpfc_agent.process = mock_process
 
@@ -140,6 +141,54 @@ def test_delegation_block_is_not_parsed_as_subtasks(dlpfc_agent):
     assert not any(t.strip() in {"NO", "YES"} or t.startswith(("YES", "NO")) for t in texts)
 
 
+def test_line_naming_two_regions_keeps_the_fixed_precedence(dlpfc_agent):
+    """VMPFC > OFC > ACC > MPFC decides, not which region is mentioned first."""
+    reply = "* OFC & VMPFC: weigh the money against the stress\n1. Plan the move\n   Agent: ACC and OFC\n"
+    subtasks = dlpfc_agent._parse_subtasks(reply)
+
+    assert [(s["task"], s["agent"]) for s in subtasks] == [
+        ("weigh the money against the stress", "VMPFC Agent"),
+        ("Plan the move", "OFC Agent"),
+    ]
+
+
+def test_capitalized_follow_up_assignment_is_parsed(dlpfc_agent):
+    """A follow-up "Assign to OFC" line was split on lowercase "assign to",
+    raised IndexError, and collapsed the whole reply into the error subtask."""
+    reply = "1. Compare the offers\n   Assign to OFC\n2. ACC: check for conflicts\n"
+    subtasks = dlpfc_agent._parse_subtasks(reply)
+
+    assert [(s["task"], s["agent"]) for s in subtasks] == [
+        ("Compare the offers", "OFC Agent"),
+        ("check for conflicts", "ACC Agent"),
+    ]
+
+
+def test_long_whitespace_run_parses_in_linear_time(dlpfc_agent):
+    """The line regex backtracked quadratically on a run of spaces inside a
+    line that names a section: this reply took over ten seconds to parse."""
+    reply = "Subtask" + " " * 40_000 + "notes\n1. Compare the offers - Assign to OFC\n"
+
+    started = time.perf_counter()
+    subtasks = dlpfc_agent._parse_subtasks(reply)
+
+    assert time.perf_counter() - started < 1.0
+    assert [(s["task"], s["agent"]) for s in subtasks] == [("Compare the offers", "OFC")]
+
+
+def test_fixed_instructions_form_a_shared_prompt_prefix(dlpfc_agent, test_state):
+    """The instructions sat after the task and feedback, so calls shared no
+    prefix a provider could reuse."""
+    other = {**test_state, "task": "a different task", "feedback": "other"}
+    for prompt in (dlpfc_agent.prompt, dlpfc_agent._create_delegation_prompt()):
+        first = prompt.format_messages(**dlpfc_agent.prompt_inputs(test_state, prompt))
+        second = prompt.format_messages(**dlpfc_agent.prompt_inputs(other, prompt))
+
+        assert first[0].type == "system"
+        assert first[0].content == second[0].content
+        assert "test task" in first[1].content
+
+
 def test_unknown_markdown_header_is_not_emitted_as_a_bullet(dlpfc_agent):
     """"**Analysis:**" starts with '*', so it fell through to the bullet branch
     and was rendered as a content bullet under the previous section's heading
@@ -217,42 +266,35 @@ async def test_dlpfc_parse_subtasks(dlpfc_agent):
     assert all(isinstance(task, dict) for task in subtasks)
     assert all("task" in task and "agent" in task for task in subtasks)
 
+@pytest.mark.parametrize("response", [
+    "",
+    "{invalid json}",
+    "Random text without structure",
+    """
+    Here's the task breakdown:
+    1. Incomplete task
+    Integration plan:
+    """,
+    """
+    Here's the task breakdown:
+    Invalid task format
+    No proper numbering or structure
+    """,
+], ids=["empty", "bad_json", "no_structure", "incomplete", "bad_format"])
 @pytest.mark.asyncio
-async def test_malformed_llm_response(dlpfc_agent, test_state):
+async def test_malformed_llm_response(dlpfc_agent, test_state, response):
     """Test handling of malformed LLM responses."""
-    malformed_responses = [
-        # Empty response
-        "",
-        # Invalid JSON
-        "{invalid json}",
-        # Missing required sections
-        "Random text without structure",
-        # Incomplete structure
-        """
-        Here's the task breakdown:
-        1. Incomplete task
-        Integration plan:
-        """,
-        # Invalid task format
-        """
-        Here's the task breakdown:
-        Invalid task format
-        No proper numbering or structure
-        """
-    ]
-
-    for response in malformed_responses:
-        mock_response = AsyncMock()
-        mock_response.content = response
-        dlpfc_agent.llm = AsyncMock()
-        dlpfc_agent.llm.ainvoke = AsyncMock(return_value=mock_response)
+    mock_response = AsyncMock()
+    mock_response.content = response
+    dlpfc_agent.llm = AsyncMock()
+    dlpfc_agent.llm.ainvoke = AsyncMock(return_value=mock_response)
 
-        result = await dlpfc_agent.process(test_state)
-        assert isinstance(result, dict)
-        assert "subtasks" in result
-        assert isinstance(result["subtasks"], list)
-        # Should handle malformed input gracefully
-        assert not result.get("error", False)
+    result = await dlpfc_agent.process(test_state)
+    assert isinstance(result, dict)
+    assert "subtasks" in result
+    assert isinstance(result["subtasks"], list)
+    # Should handle malformed input gracefully
+    assert not result.get("error", False)
 
 @pytest.mark.asyncio
 async def test_complex_subtask_assignments(dlpfc_agent):
@@ -343,46 +385,44 @@ async def test_concurrent_subtask_processing(dlpfc_agent):
     assert len(agents) == 3
     assert set(agents) == {"VMPFC", "OFC", "ACC"}
 
+@pytest.mark.parametrize("response", [
+    # Mixed formatting
+    """
+    **Task Breakdown:**
+    1. *Task 1* - Assign to VMPFC
+    2. __Task 2__ - Assign to OFC
+    
+    # Integration Plan
+    * Step 1
+    * Step 2
+    """,
+    # Unicode characters
+    """
+    📋 Tasks:
+    1️⃣ Task 1 - Assign to VMPFC
+    2️⃣ Task 2 - Assign to OFC
+    
+    🔄 Integration:
+    ⭐ Step 1
+    ⭐ Step 2
+    """,
+    # HTML-like formatting
+    """
+    <h1>Task Breakdown:</h1>
+    <ul>
+    <li>Task 1 - Assign to VMPFC</li>
+    <li>Task 2 - Assign to OFC</li>
+    </ul>
+    """,
+], ids=["mixed_markdown", "unicode", "html"])
 @pytest.mark.asyncio
-async def test_response_formatting_edge_cases(dlpfc_agent):
+async def test_response_formatting_edge_cases(dlpfc_agent, response):
     """Test edge cases in response formatting."""
-    edge_case_responses = [
-        # Mixed formatting
-        """
-        **Task Breakdown:**
-        1. *Task 1* - Assign to VMPFC
-        2. __Task 2__ - Assign to OFC
-        
-        # Integration Plan
-        * Step 1
-        * Step 2
-        """,
-        # Unicode characters
-        """
-        📋 Tasks:
-        1️⃣ Task 1 - Assign to VMPFC
-        2️⃣ Task 2 - Assign to OFC
-        
-        🔄 Integration:
-        ⭐ Step 1
-        ⭐ Step 2
-        """,
-        # HTML-like formatting
-        """
-        <h1>Task Breakdown:</h1>
-        <ul>
-        <li>Task 1 - Assign to VMPFC</li>
-        <li>Task 2 - Assign to OFC</li>
-        </ul>
-        """
-    ]
-
-    for response in edge_case_responses:
-        formatted = dlpfc_agent._format_response(response)
-        assert isinstance(formatted, dict)
-        assert "response" in formatted
-        assert not formatted["error"]
-        # Response should be a dict with content
-        assert isinstance(formatted["response"], dict)
-        assert "content" in formatted["response"]
-        assert isinstance(formatted["response"]["content"], str)
+    formatted = dlpfc_agent._format_response(response)
+    assert isinstance(formatted, dict)
+    assert "response" in formatted
+    assert not formatted["error"]
+    # Response should be a dict with content
+    assert isinstance(formatted["response"], dict)
+    assert "content" in formatted["response"]
+    assert isinstance(formatted["response"]["content"], str)
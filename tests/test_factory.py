@@ -70,3 +70,20 @@ def test_ollama_config_does_not_need_huggingface_installed(monkeypatch):
 
     llm = LLMFactory.create_llm({"provider": "ollama", "name": "llama3.2"})
     assert llm.model == "llama3.2"
+
+
+@pytest.mark.asyncio
+async def test_agents_on_one_loop_share_a_model():
+    """Agents are rebuilt every stage; each used to build its own model and so
+    its own HTTP connection pool, and no stage reused a warm connection."""
+    config = {"provider": "ollama", "name": "llama3.2"}
+
+    first = LLMFactory.shared_llm(config)
+    assert LLMFactory.shared_llm(dict(config)) is first
+    assert LLMFactory.shared_llm({**config, "temperature": 0}) is not first
+
+
+def test_no_sharing_outside_an_event_loop():
+    """An async client is bound to the loop it first ran on."""
+    config = {"provider": "ollama", "name": "llama3.2"}
+    assert LLMFactory.shared_llm(config) is not LLMFactory.shared_llm(config)
@@ -2,21 +2,24 @@
 
 These run fully offline: no workflow is invoked and no provider is contacted.
 The feedback-history file is redirected to a temporary path so tests never write
-the repo-root `feedback_history.json`.
+the repo-root `feedback_history.jsonl`.
 """
 
+import json
+
 import pytest
 
 import main
-from main import load_feedback_history, save_feedback_history
+from main import load_feedback_history, save_feedback_entry, save_feedback_history
 from workflow import process_hitl_feedback
 
 
 @pytest.fixture
 def temp_feedback_file(tmp_path, monkeypatch):
     """Point the feedback-history persistence at a temp file for the test."""
-    path = tmp_path / "feedback_history.json"
+    path = tmp_path / "feedback_history.jsonl"
     monkeypatch.setattr(main, "FEEDBACK_HISTORY_FILE", str(path))
+    monkeypatch.setattr(main, "LEGACY_FEEDBACK_HISTORY_FILE", str(tmp_path / "feedback_history.json"))
     return path
 
 
@@ -43,6 +46,47 @@ def test_feedback_persistence(temp_feedback_file):
     assert temp_feedback_file.exists()
 
 
+def test_feedback_entries_are_appended_not_rewritten(temp_feedback_file):
+    """Each save wrote the whole history again; now it appends one line."""
+    save_feedback_entry({"feedback": "first", "stage": "value_assessment"})
+    before = temp_feedback_file.read_bytes()
+    save_feedback_entry({"feedback": "second", "stage": "conflict_detection"})
+
+    assert temp_feedback_file.read_bytes().startswith(before)
+    assert [e["feedback"] for e in load_feedback_history()] == ["first", "second"]
+
+
+def test_legacy_json_history_is_read_and_migrated(temp_feedback_file):
+    legacy = temp_feedback_file.with_name("feedback_history.json")
+    legacy.write_text(json.dumps([{"feedback": "old", "stage": "task_delegation"}]))
+
+    assert load_feedback_history() == [{"feedback": "old", "stage": "task_delegation"}]
+
+    save_feedback_entry({"feedback": "new", "stage": "value_assessment"})
+
+    assert [e["feedback"] for e in load_feedback_history()] == ["old", "new"]
+
+
+def test_corrupt_legacy_history_does_not_block_new_feedback(temp_feedback_file):
+    """Migration raised on every save, so no new entry was ever written."""
+    legacy = temp_feedback_file.with_name("feedback_history.json")
+    legacy.write_text('[{"feedback": "old", "sta')
+
+    save_feedback_entry({"feedback": "new", "stage": "value_assessment"})
+    save_feedback_entry({"feedback": "newer", "stage": "value_assessment"})
+
+    assert [e["feedback"] for e in load_feedback_history()] == ["new", "newer"]
+    assert legacy.read_text() == '[{"feedback": "old", "sta'
+
+
+def test_torn_line_does_not_lose_the_history(temp_feedback_file):
+    save_feedback_entry({"feedback": "kept"})
+    with open(temp_feedback_file, "ab") as f:
+        f.write(b'{"feedback": "cut sho')
+
+    assert load_feedback_history() == [{"feedback": "kept"}]
+
+
 def test_feedback_processing():
     """process_hitl_feedback records feedback and updates previous_response."""
     test_state = {
@@ -86,7 +130,8 @@ def test_agent_prompt_integration(mock_env_vars):
     for agent_class in (VMPFCAgent, ACCAgent, MPFCAgent):
         agent = agent_class()
         prompt_messages = agent.prompt.messages
-        template_content = str(prompt_messages[0].prompt.template) if prompt_messages else ""
+        # The context, feedback history included, is the final (human) message.
+        template_content = str(prompt_messages[-1].prompt.template) if prompt_messages else ""
         assert "Feedback History: {feedback_history}" in template_content
 
 
@@ -1,5 +1,8 @@
+import asyncio
 import json
 import pathlib
+import sys
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -7,6 +10,7 @@ from langgraph.errors import GraphRecursionError
 
 import main as main_mod
 from main import main
+from utils.loop import loop_factory
 
 
 @pytest.fixture
@@ -74,13 +78,29 @@ def test_session_log_survives_unserializable_values(tmp_path, monkeypatch):
     assert written["stages"][0]["stage"] == "task_delegation"
 
 
+def test_session_log_keeps_values_orjson_cannot_encode(tmp_path, monkeypatch):
+    """orjson writes the log; what it rejects falls back to the stdlib rather
+    than losing the log."""
+    monkeypatch.setattr(main_mod, "LOGS_DIRECTORY", str(tmp_path / "logs"))
+
+    log = _mock_session()
+    log["stages"] = [{"stage": "task_delegation", "huge": 2 ** 70, "note": "💡 ok"}]
+
+    filename = main_mod.save_session_log(log)
+
+    written = json.loads(pathlib.Path(filename).read_text(encoding="utf-8"))
+    assert written["stages"][0]["huge"] == 2 ** 70
+    assert written["stages"][0]["note"] == "💡 ok"
+
+
 def test_feedback_history_write_is_not_partial(tmp_path, monkeypatch):
-    path = tmp_path / "feedback_history.json"
+    path = tmp_path / "feedback_history.jsonl"
     monkeypatch.setattr(main_mod, "FEEDBACK_HISTORY_FILE", str(path))
+    monkeypatch.setattr(main_mod, "LEGACY_FEEDBACK_HISTORY_FILE", str(tmp_path / "feedback_history.json"))
 
-    main_mod.save_feedback_history([{"feedback": "ok", "response": object()}])
+    main_mod.save_feedback_entry({"feedback": "ok", "response": object()})
 
-    assert json.loads(path.read_text())[0]["feedback"] == "ok"
+    assert json.loads(path.read_text().splitlines()[0])["feedback"] == "ok"
 
 
 @pytest.mark.asyncio
@@ -125,6 +145,22 @@ async def test_partial_failure_is_reported_and_recorded(mock_env_vars, capsys):
     assert set(saved["agent_errors"]) == {"VMPFC", "ACC"}
 
 
+@pytest.mark.asyncio
+async def test_feedback_history_is_handed_to_the_run_without_a_copy(mock_env_vars, mock_workflow):
+    """The whole persisted history was copied into the state for every task,
+    though only its most recent entries are ever rendered."""
+    history = [{"stage": "value_assessment", "response": "r", "feedback": "f"}] * 100
+
+    with patch("main.create_workflow", return_value=mock_workflow), \
+         patch("main.load_feedback_history", return_value=history), \
+         patch("main.create_session_log", side_effect=lambda task: _mock_session()), \
+         patch("main.save_session_log", return_value="f.json"), \
+         patch("builtins.input", side_effect=AssertionError("stdin must not be read in one-shot mode")):
+        await main(["a task"])
+
+    assert mock_workflow.ainvoke.call_args[0][0]["feedback_history"] is history
+
+
 @pytest.mark.asyncio
 async def test_clean_run_is_not_marked_degraded(mock_env_vars, mock_workflow, capsys):
     saved = {}
@@ -245,7 +281,7 @@ async def test_feedback_processing(mock_env_vars):
 
     with patch("main.create_workflow", return_value=mock_workflow), \
          patch("main.load_feedback_history", return_value=[]), \
-         patch("main.save_feedback_history") as mock_save, \
+         patch("main.save_feedback_entry") as mock_save, \
          patch("main.create_session_log", side_effect=lambda task: _mock_session()), \
          patch("main.save_session_log", return_value="test_log_file.json"), \
          patch("builtins.input", side_effect=["test task", "y", "Test feedback", "exit"]):
@@ -254,9 +290,8 @@ async def test_feedback_processing(mock_env_vars):
         assert mock_workflow.ainvoke.call_count >= 1
         assert mock_save.call_count == 1
 
-        feedback_history = mock_save.call_args[0][0]
-        assert len(feedback_history) == 1
-        assert feedback_history[0]["feedback"] == "Test feedback"
+        # Only the new entry is written, not the whole history again.
+        assert mock_save.call_args[0][0]["feedback"] == "Test feedback"
 
 
 @pytest.mark.asyncio
@@ -377,6 +412,53 @@ async def test_keyboard_interrupt_handling(mock_env_vars, mock_workflow, capsys)
             assert "interrupted" in captured.out.lower()
 
 
+@pytest.mark.asyncio
+async def test_prompt_does_not_block_the_event_loop():
+    """input() ran on the loop thread, so nothing else could run while the
+    user typed. Here the "user" only answers once a coroutine on the loop has
+    run -- which deadlocks if the read blocks the loop."""
+    loop_ran = threading.Event()
+
+    def typed():
+        assert loop_ran.wait(timeout=5), "event loop was blocked during input()"
+        return "answer"
+
+    async def tick():
+        loop_ran.set()
+
+    with patch("builtins.input", side_effect=typed):
+        ticker = asyncio.create_task(tick())
+        assert await main_mod._ainput() == "answer"
+        await ticker
+
+
+def test_cli_runs_on_uvloop_when_it_is_installed(monkeypatch):
+    created = []
+
+    def new_event_loop():
+        loop = asyncio.new_event_loop()
+        created.append(loop)
+        return loop
+
+    fake_uvloop = MagicMock(new_event_loop=new_event_loop)
+    ran_on = []
+
+    async def fake_main(args):
+        ran_on.append(asyncio.get_running_loop())
+
+    monkeypatch.setitem(sys.modules, "uvloop", fake_uvloop)
+    monkeypatch.setattr(sys, "argv", ["scanue", "task"])
+    with patch("main.main", new=fake_main):
+        main_mod.cli()
+
+    assert ran_on == created
+
+
+def test_cli_falls_back_to_asyncio_without_uvloop(monkeypatch):
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+    assert loop_factory() is None
+
+
 @pytest.mark.asyncio
 async def test_missing_api_key(monkeypatch):
     """The app exits when an OpenAI-configured model is missing OPENAI_API_KEY."""
@@ -394,3 +476,26 @@ async def test_missing_api_key(monkeypatch):
         await main(["test task"])
 
     assert excinfo.value.code == 1
+
+
+def test_logging_is_written_off_the_event_loop_thread(monkeypatch):
+    """Log records are queued and written by a listener thread, so a slow
+    stderr cannot block the event loop at DEBUG."""
+    import logging
+    import logging.handlers
+
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    monkeypatch.setattr(root, "level", root.level)
+    monkeypatch.setenv("SCANUE_LOG_LEVEL", "DEBUG")
+    try:
+        main_mod.configure_logging()
+        assert [type(h) for h in root.handlers] == [logging.handlers.QueueHandler]
+        assert root.level == logging.DEBUG
+        assert main_mod._log_listener is not None
+
+        # Idempotent: a second call must not stack another handler or thread.
+        main_mod.configure_logging()
+        assert len(root.handlers) == 1
+    finally:
+        main_mod._stop_log_listener()
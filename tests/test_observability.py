@@ -154,6 +154,75 @@ async def test_a_billed_structured_attempt_is_counted():
     assert agent.last_raw_response["structured_attempts"] == 1
 
 
+@pytest.mark.asyncio
+async def test_streamed_reply_keeps_its_usage():
+    """`stream: true` reassembles the chunks; usage and the finish reason arrive
+    on the last chunk and must survive the merge."""
+    from langchain_core.messages import AIMessageChunk
+
+    from agents.specialized import VMPFCAgent
+
+    config = {"agents": {"VMPFC": {"models": {"primary": {
+        "provider": "ollama", "name": "m", "stream": True, "max_retries": 0,
+    }}}}}
+    with patch("utils.config.ConfigLoader.load_config", return_value=config), \
+         patch("agents.factory.LLMFactory.create_llm", return_value=MagicMock(model_name="m")):
+        agent = VMPFCAgent()
+
+    async def astream(messages):
+        yield AIMessageChunk(content="Weigh the ")
+        yield AIMessageChunk(
+            content="commute.",
+            usage_metadata={"input_tokens": 40, "output_tokens": 3, "total_tokens": 43},
+            response_metadata={"done_reason": "stop"},
+        )
+
+    agent.llm.astream = astream
+    agent.llm.ainvoke = MagicMock(side_effect=AssertionError("ainvoke used despite stream: true"))
+
+    result = await agent.process({"task": "t"})
+
+    assert not result["error"]
+    assert "Weigh the commute." in result["response"]["content"]
+    assert agent.last_raw_response["usage"] == {
+        "input_tokens": 40, "output_tokens": 3, "total_tokens": 43, "finish_reason": "stop",
+    }
+
+
+@pytest.mark.asyncio
+async def test_streamed_reply_is_retried_on_a_dropped_connection():
+    """RunnableRetry only wraps ainvoke; streaming through it bypassed the
+    retry policy, so `stream: true` silently turned transport retries off."""
+    from langchain_core.messages import AIMessageChunk
+
+    from agents.specialized import VMPFCAgent
+
+    config = {"agents": {"VMPFC": {"models": {"primary": {
+        "provider": "ollama", "name": "m", "stream": True, "max_retries": 2,
+    }}}}}
+    with patch("utils.config.ConfigLoader.load_config", return_value=config), \
+         patch("agents.factory.LLMFactory.create_llm", return_value=MagicMock(model_name="m")):
+        agent = VMPFCAgent()
+
+    attempts = 0
+
+    async def astream(messages):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise ConnectionError("connection reset")
+        yield AIMessageChunk(content="Second time lucky.")
+
+    agent.llm.astream = astream
+
+    with patch("agents.factory.RETRY_BACKOFF", {"max": 0.0, "jitter": 0.0}):
+        result = await agent.process({"task": "t"})
+
+    assert not result["error"]
+    assert attempts == 2
+    assert "Second time lucky." in result["response"]["content"]
+
+
 # --------------------------------------------------------------------------- #
 # Run summary
 # --------------------------------------------------------------------------- #
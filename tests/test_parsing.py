@@ -5,8 +5,11 @@ sample captured from a real run (previously in test_original_parsing.py) that
 must NOT pull in OFC/reward_processing.
 """
 
+from unittest.mock import patch
+
 import pytest
 
+import workflow
 from workflow import parse_agent_assignments
 
 # The exact DLPFC response captured from an original run. It explicitly names
@@ -96,3 +99,18 @@ def test_semantic_fallback_detects_reward_language():
 def test_mpfc_always_present():
     """Even an empty/uninformative response yields at least MPFC."""
     assert parse_agent_assignments("") == ["value_assessment"]
+
+
+@pytest.mark.parametrize("response", [
+    "- VMPFC Agent: YES\n- OFC Agent: NO",   # structured
+    "Weigh the emotional cost.",             # semantic
+    "Delegate this to ACC.",                 # pattern
+    "A complex, personal choice.",           # minimal fallback
+])
+def test_routing_builds_no_patterns_per_call(response):
+    """Every strategy formatted its patterns per keyword per call and handed
+    them to re.search; they are compiled once at import now."""
+    parse = workflow._parse_agent_assignments_cached.__wrapped__
+    with patch("workflow.re.search", side_effect=AssertionError("pattern built per call")), \
+         patch("workflow.re.compile", side_effect=AssertionError("pattern built per call")):
+        assert parse(response)[0][-1] == "value_assessment"
@@ -6,12 +6,17 @@ config the app had zero retry on any failure, and a one-second blip on a local
 server failed every stage of the run in turn.
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
+import ollama
+import openai
 import pytest
+from langchain_core.runnables import RunnableLambda
 
 from agents.base import AGENT_LLM_TIMEOUT_SECONDS, resolve_llm_timeout
-from agents.factory import LLMFactory
+from agents.breaker import CircuitBreaker, CircuitOpenError, breaker_for
+from agents.factory import LLMFactory, is_transient, transient_errors
 
 OLLAMA = {"provider": "ollama", "name": "llama3.2"}
 
@@ -99,6 +104,58 @@ class _RetryStub:
         raise last
 
 
+@pytest.mark.asyncio
+async def test_a_permanent_failure_is_not_retried():
+    """A rejected request fails the same way every time; retrying it only
+    spent the timeout budget on guaranteed failures."""
+    calls = {"n": 0}
+
+    def rejected(_):
+        calls["n"] += 1
+        raise ValueError("model 'llama9' not found")
+
+    wrapped = LLMFactory.wrap_with_retry(RunnableLambda(rejected), {**OLLAMA, "max_retries": 3})
+    with pytest.raises(ValueError):
+        await wrapped.ainvoke("x")
+    assert calls["n"] == 1
+
+
+@pytest.mark.parametrize("status,attempts", [(503, 4), (429, 4), (400, 1)])
+@pytest.mark.asyncio
+async def test_only_overload_and_rate_limit_statuses_are_retried(status, attempts):
+    """Retrying transport errors alone dropped the 429/503 bursts a busy
+    server answers with; any other 4xx fails the same way every time."""
+    calls = {"n": 0}
+
+    def answered(_):
+        calls["n"] += 1
+        raise ollama.ResponseError("server says no", status)
+
+    with patch.dict("agents.factory.RETRY_BACKOFF", {"max": 0.0, "jitter": 0.0}):
+        wrapped = LLMFactory.wrap_with_retry(RunnableLambda(answered), {**OLLAMA, "max_retries": 3})
+    with pytest.raises(ollama.ResponseError):
+        await wrapped.ainvoke("x")
+    assert calls["n"] == attempts
+
+
+def test_transport_failures_are_retryable():
+    retryable = transient_errors()
+    for error in (ConnectionError(), TimeoutError(), httpx.ReadTimeout("slow")):
+        assert isinstance(error, retryable)
+
+
+def test_http_status_errors_are_transient_only_for_429_and_5xx():
+    request = httpx.Request("POST", "http://localhost:11434/api/chat")
+
+    def status_error(code):
+        return httpx.HTTPStatusError("", request=request, response=httpx.Response(code, request=request))
+
+    assert is_transient(status_error(502))
+    assert is_transient(status_error(429))
+    assert not is_transient(status_error(404))
+    assert not is_transient(ValueError("model not found"))
+
+
 def test_attempts_include_the_initial_try():
     """`max_retries: 3` must mean 3 retries after the first attempt, not 3 total."""
     runnable = MagicMock()
@@ -123,3 +180,109 @@ async def test_agent_invokes_through_the_retry_wrapper():
     with patch.object(LLMFactory, "wrap_with_retry", return_value=MagicMock()) as wrap:
         agent.invoker()
     wrap.assert_called_once()
+
+
+# --------------------------------------------------------------------------- #
+# Circuit breaker
+# --------------------------------------------------------------------------- #
+
+def test_breaker_opens_after_consecutive_outages_and_probes_after_reset():
+    breaker = CircuitBreaker("ollama:llama3.2", fail_max=2, reset_seconds=30)
+    with patch("agents.breaker.time.monotonic", return_value=100.0):
+        breaker.before_call()
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    with patch("agents.breaker.time.monotonic", return_value=131.0):
+        breaker.before_call()  # the single half-open probe
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # everyone else still fails fast
+        breaker.record_success()
+        breaker.before_call()
+
+    assert not breaker.is_open
+
+
+def test_a_success_resets_the_failure_count():
+    breaker = CircuitBreaker("m", fail_max=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.before_call()
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast_without_calling_the_model():
+    """During an outage every stage used to wait out its own timeout and
+    retries before failing with what the first one already knew."""
+    config = {"agents": {"VMPFC": {"models": {"primary": {**OLLAMA, "max_retries": 0}}}}}
+    with patch("utils.config.ConfigLoader.load_config", return_value=config):
+        from agents.specialized import VMPFCAgent
+        agent = VMPFCAgent()
+
+    down = AsyncMock(side_effect=ConnectionError("Failed to connect to Ollama"))
+    with patch("agents.breaker.BREAKER_FAIL_MAX", 2), \
+            patch("langchain_ollama.ChatOllama.ainvoke", new=down):
+        for _ in range(3):
+            result = await agent.process({"task": "t"})
+            assert result["error"] is True
+
+    assert down.await_count == 2
+    assert "not calling it again" in result["response"]["content"]
+
+
+@pytest.mark.asyncio
+async def test_a_rejected_request_does_not_trip_the_breaker():
+    config = {"agents": {"VMPFC": {"models": {"primary": {**OLLAMA, "max_retries": 0}}}}}
+    with patch("utils.config.ConfigLoader.load_config", return_value=config):
+        from agents.specialized import VMPFCAgent
+        agent = VMPFCAgent()
+
+    rejected = AsyncMock(side_effect=ValueError("model not found"))
+    with patch("agents.breaker.BREAKER_FAIL_MAX", 1), \
+            patch("langchain_ollama.ChatOllama.ainvoke", new=rejected):
+        for _ in range(3):
+            await agent.process({"task": "t"})
+
+    assert rejected.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_openai_connection_errors_open_the_breaker():
+    """openai.APIConnectionError is not an OSError, so on the default provider
+    outages were taken for answers: each reset the count, and the breaker
+    never opened."""
+    config = {"agents": {"VMPFC": {"models": {"primary": {"provider": "openai", "name": "gpt-4o-mini"}}}}}
+    with patch("utils.config.ConfigLoader.load_config", return_value=config):
+        from agents.specialized import VMPFCAgent
+        agent = VMPFCAgent()
+
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    down = AsyncMock(side_effect=openai.APIConnectionError(request=request))
+    with patch("agents.breaker.BREAKER_FAIL_MAX", 3), \
+            patch("langchain_openai.ChatOpenAI.ainvoke", new=down):
+        for _ in range(5):
+            result = await agent.process({"task": "t"})
+            assert result["error"] is True
+
+    assert down.await_count == 3
+    assert breaker_for("openai:gpt-4o-mini").is_open
+
+
+@pytest.mark.asyncio
+async def test_a_rejected_request_leaves_the_failure_count_alone():
+    config = {"agents": {"VMPFC": {"models": {"primary": {**OLLAMA, "max_retries": 0}}}}}
+    with patch("utils.config.ConfigLoader.load_config", return_value=config):
+        from agents.specialized import VMPFCAgent
+        agent = VMPFCAgent()
+
+    replies = [ConnectionError("down"), ValueError("bad request"), ConnectionError("down")]
+    with patch("agents.breaker.BREAKER_FAIL_MAX", 2), \
+            patch("langchain_ollama.ChatOllama.ainvoke", new=AsyncMock(side_effect=replies)):
+        for _ in replies:
+            await agent.process({"task": "t"})
+
+    assert breaker_for("ollama:llama3.2").is_open
@@ -11,6 +11,7 @@ from unittest.mock import patch
 
 import pytest
 
+import agents.base as base_mod
 import main as main_mod
 from agents.base import (
     FEEDBACK_CHAR_BUDGET,
@@ -48,6 +49,34 @@ def test_only_the_most_recent_entries_are_kept():
     assert "Feedback number 0." not in rendered
 
 
+def test_rendering_does_not_walk_the_whole_history():
+    """The full list was copied on every render just to keep its tail, so each
+    prompt cost grew with the lifetime of the install."""
+    class NoIteration(list):
+        def __iter__(self):
+            raise AssertionError("whole history iterated")
+
+    rendered = format_feedback_history(NoIteration(_entry(i) for i in range(1000)))
+    assert "Feedback number 999." in rendered
+
+
+def test_same_history_is_rendered_once_per_run():
+    """Every agent in a run rendered the identical history block again."""
+    history = [_entry(i) for i in range(3)]
+    base_mod._render_feedback_history.cache_clear()
+    with patch("agents.base._clip", wraps=base_mod._clip) as clip:
+        first = format_feedback_history(history)
+        calls = clip.call_count
+        assert calls
+        assert format_feedback_history([dict(e) for e in history]) == first
+    assert clip.call_count == calls
+
+
+def test_unhashable_fields_are_still_rendered():
+    rendered = format_feedback_history([{"stage": "s", "response": {"content": "structured"}, "feedback": "f"}])
+    assert "structured" in rendered
+
+
 def test_truncation_is_announced_not_silent():
     rendered = format_feedback_history([_entry(i) for i in range(20)])
     assert f"showing the {FEEDBACK_MAX_ENTRIES} most recent of 20" in rendered
@@ -37,7 +37,8 @@ def agents():
 
 
 def _template(agent):
-    return str(agent.prompt.messages[0].prompt.template)
+    """The prompt's text across its messages (instructions, then context)."""
+    return "\n".join(str(m.prompt.template) for m in agent.prompt.messages)
 
 
 # --------------------------------------------------------------------------- #
@@ -97,6 +98,19 @@ def test_every_prompt_carries_the_shared_context_slots(agents, name):
         assert slot in template, f"{name} prompt is missing {slot}"
 
 
+@pytest.mark.parametrize("name", ["VMPFC", "OFC", "ACC", "MPFC"])
+def test_instructions_form_a_shared_prompt_prefix(agents, name):
+    """The context sat between the role and the instructions, so two calls
+    shared no prefix a provider could reuse."""
+    agent = agents[name]
+    first = agent.prompt.format_messages(**agent.prompt_inputs({"task": "one"}))
+    second = agent.prompt.format_messages(**agent.prompt_inputs({"task": "two", "feedback": "x"}))
+
+    assert first[0].type == "system"
+    assert first[0].content == second[0].content
+    assert "one" in first[1].content
+
+
 @pytest.mark.parametrize("name", ["VMPFC", "OFC", "ACC", "MPFC"])
 def test_prompts_are_substantive_not_one_line_stubs(agents, name):
     """The originals were a single sentence of instruction."""
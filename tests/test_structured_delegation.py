@@ -118,6 +118,56 @@ async def test_router_consumes_structured_decision_without_parsing(agent):
     assert delta["delegation_source"] == "structured_output"
 
 
+@pytest.mark.asyncio
+async def test_repeat_decision_at_temperature_zero_is_replayed(agent):
+    """DLPFC never went through the response cache, so re-running a task paid
+    for the same routing decision again."""
+    agent.llm = _structured_llm(AgentDelegation(vmpfc=True, ofc=False, acc=False, subtasks=["a"]))
+    agent.llm.temperature = 0
+    runnable = agent.llm.with_structured_output.return_value
+
+    first = await agent.process({"task": "t"})
+    second = await agent.process({"task": "t"})
+    await agent.process({"task": "another task"})
+
+    assert runnable.ainvoke.await_count == 2
+    assert second["delegated_agents"] == first["delegated_agents"]
+    assert second["subtasks"] == first["subtasks"]
+    assert first["raw_llm_response"]["cached"] is False
+    assert second["raw_llm_response"]["cached"] is True
+
+
+@pytest.mark.asyncio
+async def test_distinct_tasks_get_their_own_decision_with_the_semantic_tier_on(agent):
+    """The delegation prompt is mostly fixed instructions, so embedding all of
+    it made any two tasks near-duplicates and replayed one task's routing for
+    another."""
+    pytest.importorskip("numpy")
+    from agents.cache import SemanticCache
+
+    def hashed_words(text):
+        vector = [0.0] * 512
+        for word in text.lower().split():
+            vector[hash(word) % 512] += 1.0
+        return vector
+
+    agent.llm = _structured_llm(AgentDelegation(vmpfc=True, ofc=False, acc=False))
+    agent.llm.temperature = 0
+    runnable = agent.llm.with_structured_output.return_value
+    runnable.ainvoke.side_effect = [
+        AgentDelegation(vmpfc=True, ofc=False, acc=False),
+        AgentDelegation(vmpfc=False, ofc=True, acc=False),
+    ]
+
+    with patch("agents.dlpfc.SEMANTIC_CACHE", SemanticCache(embed=hashed_words, enabled=True)):
+        first = await agent.process({"task": "Should I tell my friend the truth about the party?"})
+        second = await agent.process({"task": "Which savings account pays the best interest?"})
+
+    assert runnable.ainvoke.await_count == 2
+    assert first["delegated_agents"] != second["delegated_agents"]
+    assert second["raw_llm_response"]["cached"] is False
+
+
 # --------------------------------------------------------------------------- #
 # Fallbacks -- older/weaker models must keep working
 # --------------------------------------------------------------------------- #
@@ -195,12 +245,25 @@ async def test_structured_timeout_does_not_trigger_a_second_call(agent):
 @pytest.mark.parametrize("response,expected_source", [
     ("- VMPFC Agent: YES\n- MPFC Agent: YES", "structured_text"),
     ("This is about financial cost and profit.", "semantic"),
+    ("Delegate this to ACC.", "pattern"),
     ("", "heuristic"),
 ])
 def test_parse_reports_which_strategy_decided_routing(response, expected_source):
     assert parse_agent_assignments_with_source(response)[1] == expected_source
 
 
+def test_repeated_reply_is_parsed_once_and_results_stay_independent():
+    """A re-run task on a temperature-0 model hands back the same reply, which
+    went through the whole strategy ladder again."""
+    reply = "- VMPFC Agent: YES\n- MPFC Agent: YES"
+    first = parse_agent_assignments_with_source(reply)
+    first[0].append("mutated by a caller")
+
+    with patch("workflow.logger.debug", side_effect=AssertionError("parsed again")):
+        second = parse_agent_assignments_with_source(reply)
+    assert second == (["emotional_regulation", "value_assessment"], "structured_text")
+
+
 @pytest.mark.asyncio
 async def test_delegation_source_is_recorded_in_the_session_log():
     """The label lands in logs/ so the fallback rate is measurable from real runs."""
@@ -107,6 +107,10 @@ async def test_workflow_creation(mock_env_vars, mock_llm):
     assert workflow is not None
 
 
+def test_workflow_is_compiled_once_per_process():
+    assert create_workflow() is create_workflow()
+
+
 def test_outer_timeout_exceeds_inner_timeout():
     """C4: the outer per-node timeout must be strictly greater than the inner LLM
     timeout, otherwise they race and the timeout is reported ambiguously."""
@@ -200,6 +204,47 @@ async def test_workflow_state_transitions(mock_env_vars):
     assert len(final_state["completed_stages"]) == len(expected)
 
 
+@pytest.mark.asyncio
+async def test_independent_specialists_run_concurrently(mock_env_vars):
+    """VMPFC, OFC and ACC ran one after another although none reads another's
+    answer; MPFC, which does, must still see all three."""
+    in_flight = peak = 0
+    seen_by_mpfc = None
+
+    async def slow_process(self, state):
+        nonlocal in_flight, peak, seen_by_mpfc
+        if self.agent_name == "DLPFC":
+            return _ok_response(FULL_DELEGATION)
+        if self.agent_name == "MPFC":
+            seen_by_mpfc = state.get("previous_agent_insights", "")
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _ok_response(f"{self.agent_name} analysis")
+
+    patches = _patch_all_agents(slow_process)
+    for p in patches:
+        p.start()
+    try:
+        final_state = await create_workflow().ainvoke(
+            {"task": "test task", "completed_stages": [], "session_log": {"stages": []}},
+            config={"recursion_limit": 50},
+        )
+    finally:
+        for p in patches:
+            p.stop()
+
+    assert peak == 3
+    assert all(f"{name} analysis" in seen_by_mpfc for name in ("VMPFC", "OFC", "ACC"))
+    # Recorded in delegation order, as the sequential run did.
+    assert final_state["completed_stages"] == [
+        "task_delegation", "emotional_regulation", "reward_processing",
+        "conflict_detection", "value_assessment",
+    ]
+    assert [s["stage"] for s in final_state["session_log"]["stages"]] == final_state["completed_stages"]
+
+
 @pytest.mark.asyncio
 async def test_c1_regression_always_failing_vmpfc_still_terminates(mock_env_vars):
     """C1: a specialist that ALWAYS raises must not loop forever -- the workflow
@@ -0,0 +1,18 @@
+import functools
+import os
+
+from dotenv import load_dotenv
+
+
+@functools.cache
+def load_env() -> bool:
+    """Load `.env` into the environment, once per process.
+
+    main.py and agents/base.py each called load_dotenv() at import, so every
+    start searched for and parsed the file twice. Returns whether a file was
+    loaded. Set SCANUE_SKIP_DOTENV=1 to leave the environment exactly as given
+    (containers and CI that inject variables directly).
+    """
+    if os.getenv("SCANUE_SKIP_DOTENV"):
+        return False
+    return load_dotenv()
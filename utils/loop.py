@@ -0,0 +1,17 @@
+import asyncio
+from collections.abc import Callable
+
+
+def loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """uvloop's event loop when the `fast` extra is installed, else asyncio's.
+
+    The loop only schedules I/O here -- provider calls, stdin, log writes --
+    and uvloop does that with less per-callback overhead. It does not build
+    on Windows, so its absence is the normal case there. Kept out of main.py
+    so the test suite can pick the same loop without importing the CLI.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
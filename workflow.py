@@ -1,7 +1,9 @@
 import asyncio
 import copy
+import functools
 import logging
 import re
+from collections import ChainMap
 from collections.abc import Hashable, Mapping
 from datetime import datetime
 from typing import Any, TypedDict
@@ -202,6 +204,14 @@ def _session_log_delta(
     return {"session_log": updated}
 
 
+# Brain region named in a DLPFC reply -> the router stage that runs it.
+_AGENT_STAGES = {
+    'VMPFC': 'emotional_regulation',
+    'OFC': 'reward_processing',
+    'ACC': 'conflict_detection',
+    'MPFC': 'value_assessment',
+}
+
 # Semantic keywords used only when DLPFC does not emit the structured YES/NO block.
 #
 # 'value' and 'worth' are deliberately NOT OFC keywords: MPFC *is* the value
@@ -222,9 +232,43 @@ SEMANTIC_PATTERNS = {
 _KEYWORD_SUFFIXES = r"(?:s|es|ed|ing|ly|al|ally)?"
 
 
-def _keyword_present(keyword: str, text_lower: str) -> bool:
-    """Word-boundary-anchored keyword match, tolerant of common inflections."""
-    return re.search(rf"\b{re.escape(keyword)}{_KEYWORD_SUFFIXES}\b", text_lower) is not None
+# Last-resort routing (strategy 3 in parse_agent_assignments_with_source): does
+# the reply mention the agent at all, roughly as an assignment. One compiled
+# alternation per agent; its five patterns used to be separate re.search calls,
+# each scanning the whole reply and going through the re module's cache.
+_PATTERN_FALLBACK_RES = {
+    name: re.compile("|".join((
+        f"{name} agent",
+        f"{name}:",
+        f"assign.*{name}",
+        f"delegate.*{name}",
+        f"{name}.*agent",
+    )))
+    for name in ("vmpfc", "ofc", "acc", "mpfc")
+}
+
+
+def _keyword_pattern(keywords: list[str]) -> re.Pattern[str]:
+    """Word-boundary-anchored match for any of `keywords`, tolerant of common inflections."""
+    return re.compile(rf"\b(?:{'|'.join(map(re.escape, keywords))}){_KEYWORD_SUFFIXES}\b")
+
+
+# The routing patterns below used to be built per keyword per call, as
+# f-strings handed to re.search: every reply paid for formatting them and
+# for the re module's cache lookup, once per keyword. Each list is now one
+# compiled alternation, built at import.
+
+# Strategy 1: "- VMPFC Agent: YES", "VMPFC Agent: YES" or "- VMPFC: YES".
+_STRUCTURED_YES_RES = {
+    name: re.compile(rf"{name.lower()} agent:\s*yes|- {name.lower()}:\s*yes")
+    for name in _AGENT_STAGES
+}
+# Strategy 2, per agent.
+_SEMANTIC_RES = {name: _keyword_pattern(keywords) for name, keywords in SEMANTIC_PATTERNS.items()}
+# The minimal fallback's task classification.
+_COMPLEXITY_RE = _keyword_pattern(['complex', 'difficult', 'multiple', 'various', 'several', 'many', 'challenging'])
+_EMOTIONAL_RE = _keyword_pattern(['feel', 'emotion', 'relationship', 'social', 'personal', 'family', 'friend'])
+_DECISION_RE = _keyword_pattern(['decide', 'choice', 'option', 'should', 'better', 'prefer', 'recommend'])
 
 
 def parse_agent_assignments(dlpfc_response: str) -> list:
@@ -255,16 +299,22 @@ def parse_agent_assignments_with_source(dlpfc_response: str) -> tuple:
     Returns:
         tuple: (stage names in execution order, source label)
     """
+    stages, source = _parse_agent_assignments_cached(dlpfc_response)
+    return list(stages), source
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_agent_assignments_cached(dlpfc_response: str) -> tuple[tuple[str, ...], str]:
+    """The parse behind parse_agent_assignments_with_source, memoized.
+
+    A pure function of the reply text, and replies recur -- a temperature-0
+    model hands back the same reply whenever a task is re-run -- yet each one
+    went through the full regex ladder again. Returns tuples so no caller can
+    mutate a cached result.
+    """
     agent_assignments = []
     source = "heuristic"
-
-    # Agent name mappings
-    agent_map = {
-        'VMPFC': 'emotional_regulation',
-        'OFC': 'reward_processing',
-        'ACC': 'conflict_detection',
-        'MPFC': 'value_assessment'
-    }
+    agent_map = _AGENT_STAGES
 
     response_lower = dlpfc_response.lower()
 
@@ -273,69 +323,44 @@ def parse_agent_assignments_with_source(dlpfc_response: str) -> tuple:
     # STRATEGY 1: Parse structured format (YES/NO responses)
     structured_found = False
     for agent_name, stage_name in agent_map.items():
-        # Look for "- VMPFC Agent: YES" pattern
-        yes_patterns = [
-            rf"- {agent_name.lower()} agent:\s*yes",
-            rf"{agent_name.lower()} agent:\s*yes",
-            rf"- {agent_name.lower()}:\s*yes"
-        ]
-
-        for pattern in yes_patterns:
-            if re.search(pattern, response_lower):
-                if stage_name not in agent_assignments:
-                    agent_assignments.append(stage_name)
-                    structured_found = True
-                    source = "structured_text"
-                    logger.debug("Structured format: %s -> %s", agent_name, stage_name)
-                break
+        if _STRUCTURED_YES_RES[agent_name].search(response_lower) and stage_name not in agent_assignments:
+            agent_assignments.append(stage_name)
+            structured_found = True
+            source = "structured_text"
+            logger.debug("Structured format: %s -> %s", agent_name, stage_name)
 
     # STRATEGY 2: Semantic keyword analysis (if structured format not found)
     if not structured_found:
         logger.debug("Using semantic analysis fallback...")
 
-        for agent_name, keywords in SEMANTIC_PATTERNS.items():
+        for agent_name, pattern in _SEMANTIC_RES.items():
             # Check if any semantic keywords are present
-            for keyword in keywords:
-                if _keyword_present(keyword, response_lower):
-                    stage_name = agent_map[agent_name]
-                    if stage_name not in agent_assignments:
-                        agent_assignments.append(stage_name)
-                        source = "semantic"
-                        logger.debug("Semantic match: '%s' -> %s -> %s", keyword, agent_name, stage_name)
-                    break
+            match = pattern.search(response_lower)
+            if match:
+                stage_name = agent_map[agent_name]
+                if stage_name not in agent_assignments:
+                    agent_assignments.append(stage_name)
+                    source = "semantic"
+                    logger.debug("Semantic match: '%s' -> %s -> %s", match.group(), agent_name, stage_name)
 
     # STRATEGY 3: Original pattern matching (final fallback)
     if not agent_assignments:
         logger.debug("Using original pattern matching...")
         for agent_name, stage_name in agent_map.items():
-            patterns = [
-                f"{agent_name.lower()} agent",
-                f"{agent_name.lower()}:",
-                f"assign.*{agent_name.lower()}",
-                f"delegate.*{agent_name.lower()}",
-                f"{agent_name.lower()}.*agent"
-            ]
-
-            for pattern in patterns:
-                if re.search(pattern, response_lower):
-                    if stage_name not in agent_assignments:
-                        agent_assignments.append(stage_name)
-                        source = "pattern"
-                        logger.debug("Pattern match: '%s' -> %s -> %s", pattern, agent_name, stage_name)
-                    break
+            match = _PATTERN_FALLBACK_RES[agent_name.lower()].search(response_lower)
+            if match and stage_name not in agent_assignments:
+                agent_assignments.append(stage_name)
+                source = "pattern"
+                logger.debug("Pattern match: '%s' -> %s -> %s", match.group(), agent_name, stage_name)
 
     # INTELLIGENT FALLBACK: Use minimal viable agents instead of all agents
     if not agent_assignments:
         logger.debug("No specific agents detected, using intelligent minimal fallback...")
 
         # Analyze task complexity for intelligent fallback
-        complexity_indicators = ['complex', 'difficult', 'multiple', 'various', 'several', 'many', 'challenging']
-        emotional_indicators = ['feel', 'emotion', 'relationship', 'social', 'personal', 'family', 'friend']
-        decision_indicators = ['decide', 'choice', 'option', 'should', 'better', 'prefer', 'recommend']
-
-        is_complex = any(_keyword_present(word, response_lower) for word in complexity_indicators)
-        has_emotional = any(_keyword_present(word, response_lower) for word in emotional_indicators)
-        is_decision = any(_keyword_present(word, response_lower) for word in decision_indicators)
+        is_complex = _COMPLEXITY_RE.search(response_lower) is not None
+        has_emotional = _EMOTIONAL_RE.search(response_lower) is not None
+        is_decision = _DECISION_RE.search(response_lower) is not None
 
         if is_complex:
             # Complex tasks get full processing
@@ -360,7 +385,7 @@ def parse_agent_assignments_with_source(dlpfc_response: str) -> tuple:
         logger.debug("Added MPFC for final integration")
 
     logger.debug("Final agent delegation: %s (source=%s)", agent_assignments, source)
-    return agent_assignments, source
+    return tuple(agent_assignments), source
 
 
 async def process_task_delegation(state: AgentState) -> dict[str, Any]:
@@ -492,7 +517,7 @@ async def process_task_delegation(state: AgentState) -> dict[str, Any]:
         return delta
 
 
-def _prepare_value_assessment_state(state: Mapping[str, Any]) -> dict[str, Any]:
+def _prepare_value_assessment_state(state: Mapping[str, Any]) -> Mapping[str, Any]:
     """Enrich MPFC's input with a summary of the other agents' insights.
 
     Agents that FAILED are excluded. Their "response" is an error string such as
@@ -500,8 +525,12 @@ def _prepare_value_assessment_state(state: Mapping[str, Any]) -> dict[str, Any]:
     to the integration stage as an insight made MPFC synthesize over error text
     and present the result to the user as the answer. MPFC is told which peers
     are missing instead, so it can qualify its conclusion.
+
+    The two added keys are layered over the incoming state rather than written
+    into a copy. This used to deep-copy the entire state -- session log, every
+    stage's raw prompt and response, feedback history -- for a read-only input.
     """
-    enhanced_state: dict[str, Any] = dict(copy.deepcopy(state))
+    enhanced_state: dict[str, Any] = {}
     responses = state.get("agent_responses") or {}
     failed = set(state.get("agent_errors") or {})
 
@@ -528,94 +557,117 @@ def _prepare_value_assessment_state(state: Mapping[str, Any]) -> dict[str, Any]:
     if missing:
         enhanced_state["unavailable_agents"] = missing
 
-    return enhanced_state
+    # ChainMap is typed for mutable maps; only the overlay would ever be written.
+    return ChainMap(enhanced_state, state)  # type: ignore[arg-type]
 
 
-async def _run_specialist_stage(
+async def _call_specialist(
     state: Mapping[str, Any], stage_name: str, *, prepare_state=None
-) -> dict[str, Any]:
-    """Run a single specialist stage and return a delta dict.
-
-    Drives all four specialist stages. Copies the incoming accumulator channels
-    (agent_responses / agent_errors / completed_stages / session_log), appends
-    this stage's contribution, and returns only declared AgentState keys -- never
-    mutates the input state in place, never echoes the whole state back.
+) -> tuple[ResponseDict, str | None, bool, dict[str, Any] | None, str]:
+    """Run one specialist agent; return its outcome, not yet a state delta.
 
-    The stage is appended to completed_stages on BOTH success and failure, which
-    is what makes non-termination structurally impossible: the router will never
-    re-dispatch a stage that already ran. `error: True` is set only when the
-    final synthesis stage (value_assessment) fails.
+    Returns (response, error, answered, stage_log, status line). `answered` is
+    False when the call raised, in which case `response` is the error message
+    and is not recorded in agent_responses. Split from the delta so concurrent
+    stages can each run against the same input and be merged afterwards.
     """
     agent_name, agent_class = STAGE_AGENTS[stage_name]
     agent = agent_class()
+    title = stage_name.replace('_', ' ')
 
     stage_log = log_stage_start(state, stage_name, agent_name, agent.model_descriptor())
 
-    agent_responses = dict(state.get("agent_responses") or {})
-    agent_errors = dict(state.get("agent_errors") or {})
-    completed_stages = list(state.get("completed_stages") or [])
-
     process_input = prepare_state(state) if prepare_state else state
 
     try:
         result = await asyncio.wait_for(agent.process(process_input), timeout=NODE_TIMEOUT_SECONDS)
+    except Exception as e:
+        # asyncio.CancelledError (BaseException) intentionally propagates.
+        error_msg = f"Error in {title}: {str(e)}"
+        error_response = {"role": "assistant", "content": error_msg}
+        if stage_log:
+            stage_log = log_stage_end(stage_log, {"response": error_response}, str(e))
+        return error_response, error_msg, False, stage_log, f"❌ {error_msg}"
 
-        # Per-agent failures are recorded but do not stop the workflow.
-        agent_reported_error = None
-        if result.get("error"):
-            agent_reported_error = result.get("response", {}).get("content", "Unknown error")
-            agent_errors[agent_name] = agent_reported_error
+    # Per-agent failures are recorded but do not stop the workflow.
+    agent_reported_error = None
+    if result.get("error"):
+        agent_reported_error = result.get("response", {}).get("content", "Unknown error")
 
-        response = result.get("response", {})
-        agent_responses[agent_name] = response
+    if agent_reported_error:
+        status = f"❌ {title.title()} failed: {agent_reported_error}"
+    else:
+        status = f"✅ {title.title()} complete"
 
-        if agent_reported_error:
-            print(f"❌ {stage_name.replace('_', ' ').title()} failed: {agent_reported_error}")
-        else:
-            print(f"✅ {stage_name.replace('_', ' ').title()} complete")
+    if stage_log:
+        # Pass the error through. log_stage_end was previously called without
+        # it even when the agent reported a failure, so stage_log["error"]
+        # stayed None and failed stages were unfindable in the session log.
+        stage_log = log_stage_end(stage_log, result, agent_reported_error)
 
-        if stage_log:
-            # Pass the error through. log_stage_end was previously called without
-            # it even when the agent reported a failure, so stage_log["error"]
-            # stayed None and failed stages were unfindable in the session log.
-            stage_log = log_stage_end(stage_log, result, agent_reported_error)
+    return result.get("response", {}), agent_reported_error, True, stage_log, status
 
-        delta = {
-            "response": response,
-            "agent_responses": agent_responses,
-            "agent_errors": agent_errors,
-            "completed_stages": completed_stages + [stage_name],
-        }
-        delta.update(_session_log_delta(state, stage_log, agent_errors))
 
-        # Only a failure of the final synthesis stage marks the whole run errored.
-        if stage_name == "value_assessment" and result.get("error"):
-            delta["error"] = True
+def _specialist_delta(
+    state: Mapping[str, Any],
+    stage_name: str,
+    outcome: tuple[ResponseDict, str | None, bool, dict[str, Any] | None, str],
+) -> dict[str, Any]:
+    """Fold one specialist's outcome into a delta against `state`."""
+    response, error, answered, stage_log, status = outcome
+    agent_name = STAGE_AGENTS[stage_name][0]
+    print(status)
+
+    agent_errors = dict(state.get("agent_errors") or {})
+    if error:
+        agent_errors[agent_name] = error
 
-        return delta
+    delta: dict[str, Any] = {
+        "response": response,
+        "agent_errors": agent_errors,
+        "completed_stages": list(state.get("completed_stages") or []) + [stage_name],
+    }
+    if answered:
+        delta["agent_responses"] = {**(state.get("agent_responses") or {}), agent_name: response}
+    delta.update(_session_log_delta(state, stage_log, agent_errors))
 
-    except Exception as e:
-        # asyncio.CancelledError (BaseException) intentionally propagates.
-        error_msg = f"Error in {stage_name.replace('_', ' ')}: {str(e)}"
-        print(f"❌ {error_msg}")
+    # Only a failure of the final synthesis stage marks the whole run errored.
+    if stage_name == "value_assessment" and error:
+        delta["error"] = True
 
-        error_response = {"role": "assistant", "content": error_msg}
-        agent_errors[agent_name] = error_msg
+    return delta
 
-        if stage_log:
-            stage_log = log_stage_end(stage_log, {"response": error_response}, str(e))
 
-        delta = {
-            "response": error_response,
-            "agent_errors": agent_errors,
-            "completed_stages": completed_stages + [stage_name],
-        }
-        delta.update(_session_log_delta(state, stage_log, agent_errors))
+async def _run_specialist_stage(
+    state: Mapping[str, Any], stage_name: str, *, prepare_state=None
+) -> dict[str, Any]:
+    """Run a single specialist stage and return a delta dict.
+
+    Drives all four specialist stages. Copies the incoming accumulator channels
+    (agent_responses / agent_errors / completed_stages / session_log), appends
+    this stage's contribution, and returns only declared AgentState keys -- never
+    mutates the input state in place, never echoes the whole state back.
 
-        if stage_name == "value_assessment":
-            delta["error"] = True
+    The stage is appended to completed_stages on BOTH success and failure, which
+    is what makes non-termination structurally impossible: the router will never
+    re-dispatch a stage that already ran. `error: True` is set only when the
+    final synthesis stage (value_assessment) fails.
+    """
+    outcome = await _call_specialist(state, stage_name, prepare_state=prepare_state)
+    return _specialist_delta(state, stage_name, outcome)
 
-        return delta
+
+# Printed as each specialist stage starts.
+_STAGE_BANNERS = {
+    "emotional_regulation": "\n❤️ VMPFC Agent: Analyzing emotional aspects...",
+    "reward_processing": "\n🎯 OFC Agent: Evaluating rewards and outcomes...",
+    "conflict_detection": "\n⚡ ACC Agent: Detecting potential conflicts...",
+    "value_assessment": "\n💡 MPFC Agent: Assessing values and integrating insights...",
+}
+
+# The specialists that only read the task and DLPFC's output. MPFC is not one:
+# it integrates their answers, so it runs after all of them.
+PARALLEL_STAGES = ("emotional_regulation", "reward_processing", "conflict_detection")
 
 
 # The four named node wrappers below stay thin so the graph, tests, and session
@@ -624,30 +676,58 @@ async def _run_specialist_stage(
 
 async def process_emotional_regulation(state: AgentState) -> dict[str, Any]:
     """Process emotional regulation through VMPFC agent."""
-    print("\n❤️ VMPFC Agent: Analyzing emotional aspects...")
+    print(_STAGE_BANNERS["emotional_regulation"])
     return await _run_specialist_stage(state, "emotional_regulation")
 
 
 async def process_reward_processing(state: AgentState) -> dict[str, Any]:
     """Process reward processing through OFC agent."""
-    print("\n🎯 OFC Agent: Evaluating rewards and outcomes...")
+    print(_STAGE_BANNERS["reward_processing"])
     return await _run_specialist_stage(state, "reward_processing")
 
 
 async def process_conflict_detection(state: AgentState) -> dict[str, Any]:
     """Process conflict detection through ACC agent."""
-    print("\n⚡ ACC Agent: Detecting potential conflicts...")
+    print(_STAGE_BANNERS["conflict_detection"])
     return await _run_specialist_stage(state, "conflict_detection")
 
 
 async def process_value_assessment(state: AgentState) -> dict[str, Any]:
     """Process value assessment through MPFC agent - integrates all prior responses."""
-    print("\n💡 MPFC Agent: Assessing values and integrating insights...")
+    print(_STAGE_BANNERS["value_assessment"])
     return await _run_specialist_stage(
         state, "value_assessment", prepare_state=_prepare_value_assessment_state
     )
 
 
+async def process_specialist_analysis(state: AgentState) -> dict[str, Any]:
+    """Run every delegated VMPFC/OFC/ACC stage concurrently.
+
+    They ran one graph step each, so a three-specialist run waited for the sum
+    of three LLM calls although none reads another's answer; now it waits for
+    the slowest. Each stage runs against the same input, then the outcomes are
+    folded into one delta in delegation order -- the same result, session log
+    included, that running them one after another produced.
+    """
+    completed = set(state.get("completed_stages") or [])
+    stages = [
+        stage for stage in state.get("delegated_agents") or []
+        if stage in PARALLEL_STAGES and stage not in completed
+    ]
+    for stage in stages:
+        print(_STAGE_BANNERS[stage])
+
+    outcomes = await asyncio.gather(*(_call_specialist(state, stage) for stage in stages))
+
+    merged: Mapping[str, Any] = state
+    delta: dict[str, Any] = {}
+    for stage, outcome in zip(stages, outcomes, strict=True):
+        step = _specialist_delta(merged, stage, outcome)
+        delta.update(step)
+        merged = ChainMap(step, merged)  # type: ignore[arg-type]
+    return delta
+
+
 def get_next_stage(state: Mapping[str, Any]) -> str:
     """Router: pick the first delegated stage that has not completed yet.
 
@@ -663,23 +743,37 @@ def get_next_stage(state: Mapping[str, Any]) -> str:
     return END
 
 
+def route_next_stage(state: Mapping[str, Any]) -> str:
+    """Graph router: `get_next_stage`, with the independent specialists batched.
+
+    When the next stage is VMPFC, OFC or ACC, all of them that are pending run
+    together in the specialist_analysis node.
+    """
+    stage = get_next_stage(state)
+    return "specialist_analysis" if stage in PARALLEL_STAGES else stage
+
+
+@functools.lru_cache(maxsize=1)
 def create_workflow() -> CompiledStateGraph:
-    """Create the dynamic workflow graph."""
+    """Create the dynamic workflow graph.
+
+    Built once per process: the graph has no per-run state (everything a run
+    needs travels in its AgentState), and a compiled graph can serve any number
+    of concurrent `ainvoke` calls. Rebuilding it resolved every node and edge
+    again for an identical result.
+    """
     workflow = StateGraph(AgentState)
 
     # Add nodes
+    # VMPFC, OFC and ACC run inside specialist_analysis; their single-stage
+    # nodes stay importable for callers that drive one stage directly.
     workflow.add_node("task_delegation", process_task_delegation)
-    workflow.add_node("emotional_regulation", process_emotional_regulation)
-    workflow.add_node("reward_processing", process_reward_processing)
-    workflow.add_node("conflict_detection", process_conflict_detection)
+    workflow.add_node("specialist_analysis", process_specialist_analysis)
     workflow.add_node("value_assessment", process_value_assessment)
 
     # Every stage routes through the same conditional edge function. The mapping
     # below enumerates every possible target so LangGraph always has a valid path.
-    all_stages = [
-        "task_delegation", "emotional_regulation", "reward_processing",
-        "conflict_detection", "value_assessment",
-    ]
+    all_stages = ["task_delegation", "specialist_analysis", "value_assessment"]
 
     comprehensive_mappings: dict[Hashable, str] = {END: END}
     for target_stage in all_stages:
@@ -688,7 +782,7 @@ def create_workflow() -> CompiledStateGraph:
     for stage in all_stages:
         workflow.add_conditional_edges(
             stage,
-            get_next_stage,
+            route_next_stage,
             comprehensive_mappings
         )
 